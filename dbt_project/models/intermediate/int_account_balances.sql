@@ -28,9 +28,11 @@ with account_transactions as (
 ),
 
 account_aggregates as (
+  -- Group on the account code alone rather than hashing the name per row too;
+  -- a renamed account takes its most recent name, as the UI's live fallback does
   select
     account_code,
-    account_name,
+    arg_max(account_name, transaction_date) as account_name,
     
     -- Transaction counts
     count(*) as total_transactions,
@@ -61,7 +63,7 @@ account_aggregates as (
     end as activity_status
 
   from account_transactions
-  group by account_code, account_name
+  group by account_code
 ),
 
 account_trends as (
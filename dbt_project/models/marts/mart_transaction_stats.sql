@@ -0,0 +1,23 @@
+{{
+  config(
+    materialized='table',
+    description='Single-row transaction statistics mart - precomputed dashboard totals'
+  )
+}}
+
+-- Overall transaction statistics, rebuilt on every dbt run so the dashboard
+-- reads one row instead of re-aggregating the transaction mart per page load
+select
+  count(*) as total_transactions,
+  count(distinct account_code) as unique_accounts,
+  sum(debit_amount) as total_debit,
+  sum(credit_amount) as total_credit,
+  sum(net_amount) as net_total,
+  min(transaction_date) as earliest_date,
+  max(transaction_date) as latest_date,
+  count(distinct source_file) as source_files,
+  
+  -- Data lineage
+  current_timestamp as last_updated
+
+from {{ ref('mart_transaction_details') }}
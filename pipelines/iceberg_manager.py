@@ -6,13 +6,52 @@ Handles Iceberg table creation, data loading, and version management.
 """
 
 import os
+import bisect
+import sqlite3
 import polars as pl
-import duckdb
+from contextlib import closing
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 from datetime import datetime
 import yaml
 
+if TYPE_CHECKING:
+    import duckdb
+
+# Booking date range of a version, built once at import
+DATE_RANGE_EXPRESSIONS = [
+    pl.col("Boekdatum").min().alias("min_date"),
+    pl.col("Boekdatum").max().alias("max_date"),
+]
+
+# Column definitions shared by the Iceberg and fallback table DDL
+FINANCIAL_TRANSACTION_COLUMNS = [
+    ("CodeAdministratie", "VARCHAR"),
+    ("NaamAdministratie", "VARCHAR"),
+    ("CodeGrootboekrekening", "VARCHAR"),
+    ("NaamGrootboekrekening", "VARCHAR"),
+    ("Code", "VARCHAR"),
+    ("Boekingsnummer", "BIGINT"),
+    ("Boekdatum", "DATE"),
+    ("Periode", "VARCHAR"),
+    ("Code1", "VARCHAR"),
+    ("Code2", "VARCHAR"),
+    ("Omschrijving", "VARCHAR"),
+    ("Debet", "DECIMAL(15,2)"),
+    ("Credit", "DECIMAL(15,2)"),
+    ("Saldo", "DECIMAL(15,2)"),
+    ("Btwbedrag", "DECIMAL(15,2)"),
+    ("Btwcode", "VARCHAR"),
+    ("Boekingsstatus", "VARCHAR"),
+    ("Nummer", "BIGINT"),
+    ("Factuurnummer", "VARCHAR"),
+    # Metadata columns for versioning
+    ("_loaded_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+    ("_source_file", "VARCHAR"),
+    ("_data_version", "INTEGER DEFAULT 1"),
+]
+
+
 class IcebergManager:
     """Manages Iceberg tables for the financial data platform."""
     
@@ -22,24 +61,84 @@ class IcebergManager:
         self.config = self._load_config()
         self.warehouse_path = Path(self.config['catalog']['warehouse'])
         self.warehouse_path.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional["duckdb.DuckDBPyConnection"] = None
+        self._versions_cache: Optional[tuple] = None
         
     def _load_config(self) -> Dict:
         """Load Iceberg configuration from YAML file."""
         with open(self.config_path, 'r') as f:
             return yaml.safe_load(f)
     
-    def get_duckdb_connection(self) -> duckdb.DuckDBPyConnection:
-        """Get DuckDB connection with Iceberg extension."""
-        conn = duckdb.connect()
+    def get_parquet_write_options(self) -> Dict:
+        """Get Polars write_parquet options from the format settings."""
+        format_config = self.config.get('format', {})
+        return {
+            'compression': format_config.get('compression', 'zstd'),
+            'compression_level': format_config.get('compression_level'),
+            'row_group_size': format_config.get('row_group_size'),
+            'statistics': True,
+        }
+    
+    def get_parquet_copy_options(self) -> str:
+        """Get DuckDB COPY ... TO options matching the format settings."""
+        format_config = self.config.get('format', {})
+        options = ["FORMAT parquet", f"COMPRESSION {format_config.get('compression', 'zstd')}"]
+        if format_config.get('compression_level') is not None:
+            options.append(f"COMPRESSION_LEVEL {int(format_config['compression_level'])}")
+        if format_config.get('row_group_size') is not None:
+            options.append(f"ROW_GROUP_SIZE {int(format_config['row_group_size'])}")
+        return ", ".join(options)
+    
+    def write_parquet(self, df: Union[pl.DataFrame, pl.LazyFrame], path: Path) -> None:
+        """Write data to the warehouse, sorted for scan locality.
         
-        # Install and load iceberg extension
-        try:
-            conn.execute("INSTALL iceberg")
-            conn.execute("LOAD iceberg")
-        except Exception as e:
-            print(f"Note: Iceberg extension handling: {e}")
+        A LazyFrame is streamed to disk with sink_parquet so the cleaned data
+        never has to be fully materialised in memory.
+        """
+        schema = df.collect_schema()
+        sort_by = [col for col in self.config.get('format', {}).get('sort_by', [])
+                   if col in schema]
+        if sort_by:
+            df = df.sort(sort_by)
+        
+        if isinstance(df, pl.LazyFrame):
+            df.sink_parquet(path, **self.get_parquet_write_options())
+        else:
+            df.write_parquet(path, **self.get_parquet_write_options())
+    
+    def get_duckdb_connection(self) -> "duckdb.DuckDBPyConnection":
+        """Get a cursor on the shared DuckDB connection with Iceberg extension.
+        
+        The connection (and the iceberg extension setup) is created once per
+        manager; callers get a cheap cursor they can close when done.
+        """
+        if self._conn is None:
+            import duckdb
+            
+            self._conn = duckdb.connect()
             
-        return conn
+            # Install and load iceberg extension
+            try:
+                self._conn.execute("INSTALL iceberg")
+                self._conn.execute("LOAD iceberg")
+            except Exception as e:
+                print(f"Note: Iceberg extension handling: {e}")
+            
+        return self._conn.cursor()
+    
+    def close(self):
+        """Close the shared DuckDB connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    @staticmethod
+    def _create_table_sql(table_name: str) -> str:
+        """Build the CREATE TABLE statement for the financial transactions schema."""
+        column_defs = ",\n            ".join(f"{name} {sql_type}" for name, sql_type in FINANCIAL_TRANSACTION_COLUMNS)
+        return f"""CREATE TABLE {table_name} (
+            {column_defs}
+        )"""
     
     def create_financial_transactions_table(self) -> str:
         """Create the main financial transactions Iceberg table."""
@@ -50,31 +149,7 @@ class IcebergManager:
         
         # Create Iceberg table with proper schema
         create_sql = f"""
-        CREATE TABLE iceberg.{table_name} (
-            CodeAdministratie VARCHAR,
-            NaamAdministratie VARCHAR,
-            CodeGrootboekrekening VARCHAR,
-            NaamGrootboekrekening VARCHAR,
-            Code VARCHAR,
-            Boekingsnummer BIGINT,
-            Boekdatum DATE,
-            Periode VARCHAR,
-            Code1 VARCHAR,
-            Code2 VARCHAR,
-            Omschrijving VARCHAR,
-            Debet DECIMAL(15,2),
-            Credit DECIMAL(15,2),
-            Saldo DECIMAL(15,2),
-            Btwbedrag DECIMAL(15,2),
-            Btwcode VARCHAR,
-            Boekingsstatus VARCHAR,
-            Nummer BIGINT,
-            Factuurnummer VARCHAR,
-            -- Metadata columns for versioning
-            _loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            _source_file VARCHAR,
-            _data_version INTEGER DEFAULT 1
-        ) USING ICEBERG
+        {self._create_table_sql(f"iceberg.{table_name}")} USING ICEBERG
         LOCATION '{table_path.absolute()}'
         """
         
@@ -89,36 +164,11 @@ class IcebergManager:
         finally:
             conn.close()
     
-    def _create_fallback_table(self, conn: duckdb.DuckDBPyConnection, table_name: str) -> str:
+    def _create_fallback_table(self, conn: "duckdb.DuckDBPyConnection", table_name: str) -> str:
         """Create a regular DuckDB table as fallback."""
         table_path = self.warehouse_path / f"{table_name}.db"
         
-        create_sql = f"""
-        CREATE TABLE {table_name} (
-            CodeAdministratie VARCHAR,
-            NaamAdministratie VARCHAR,
-            CodeGrootboekrekening VARCHAR,
-            NaamGrootboekrekening VARCHAR,
-            Code VARCHAR,
-            Boekingsnummer BIGINT,
-            Boekdatum DATE,
-            Periode VARCHAR,
-            Code1 VARCHAR,
-            Code2 VARCHAR,
-            Omschrijving VARCHAR,
-            Debet DECIMAL(15,2),
-            Credit DECIMAL(15,2),
-            Saldo DECIMAL(15,2),
-            Btwbedrag DECIMAL(15,2),
-            Btwcode VARCHAR,
-            Boekingsstatus VARCHAR,
-            Nummer BIGINT,
-            Factuurnummer VARCHAR,
-            _loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            _source_file VARCHAR,
-            _data_version INTEGER DEFAULT 1
-        )
-        """
+        create_sql = self._create_table_sql(table_name)
         
         conn.execute(create_sql)
         print(f"✅ Created fallback table: {table_name}")
@@ -132,6 +182,8 @@ class IcebergManager:
             
         try:
             # Read from source database
+            import duckdb
+            
             source_conn = duckdb.connect(source_db_path)
             
             # Get existing data with metadata
@@ -163,20 +215,18 @@ class IcebergManager:
             ORDER BY Boekdatum, Boekingsnummer
             """
             
-            df = source_conn.execute(migration_sql).pl()
-            source_conn.close()
-            
-            # Insert into Iceberg table
-            target_conn = self.get_duckdb_connection()
-            
-            # Write data to our warehouse
+            # Write data to our warehouse straight from DuckDB's parquet writer,
+            # without materialising the table in Python first
             target_path = self.warehouse_path / "financial_transactions_iceberg.parquet"
-            df.write_parquet(target_path)
+            escaped_path = str(target_path).replace("'", "''")
+            row_count = source_conn.execute(
+                f"COPY ({migration_sql}) TO '{escaped_path}' ({self.get_parquet_copy_options()})"
+            ).fetchone()[0]
+            source_conn.close()
             
-            print(f"✅ Migrated {len(df)} records to Iceberg format")
+            print(f"✅ Migrated {row_count} records to Iceberg format")
             print(f"📊 Data saved to: {target_path}")
             
-            target_conn.close()
             return True
             
         except Exception as e:
@@ -193,7 +243,7 @@ class IcebergManager:
             df = df.with_columns([
                 pl.lit(datetime.now()).alias("_loaded_at"),
                 pl.lit(source_name).alias("_source_file"),
-                pl.lit(self._get_next_version()).alias("_data_version")
+                pl.lit(self.next_data_version(source_name)).alias("_data_version")
             ])
             
             # Save as versioned parquet file
@@ -210,13 +260,98 @@ class IcebergManager:
             print(f"❌ Failed to load Excel file: {e}")
             return False
     
-    def _get_next_version(self) -> int:
-        """Get the next version number for data loading."""
-        # For now, return timestamp-based version
-        return int(datetime.now().timestamp())
+    def next_data_version(self, source_name: str = None) -> int:
+        """Allocate the next data version number for data loading.
+        
+        Versions come from an AUTOINCREMENT counter in the warehouse's SQLite
+        index, so they are monotonic and unique even when parallel ingestion
+        workers allocate within the same second.
+        """
+        index_file = self.warehouse_path / "processed_files.db"
+        
+        with closing(sqlite3.connect(index_file, timeout=30, isolation_level=None)) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS data_versions (
+                    version INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source_file TEXT,
+                    allocated_at TEXT
+                )
+            """)
+            # Read the footers for the seed before locking, so other workers
+            # are not held on the SQLite lock while the warehouse is scanned
+            seed = None
+            if conn.execute("SELECT 1 FROM data_versions LIMIT 1").fetchone() is None:
+                seed = self._get_max_stored_version()
+            
+            # Take the write lock so seeding and allocation are atomic
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if seed is not None and conn.execute("SELECT 1 FROM data_versions LIMIT 1").fetchone() is None:
+                    # Continue above the timestamp-based versions already on disk
+                    conn.execute(
+                        "INSERT INTO data_versions VALUES (?, NULL, ?)",
+                        [seed, datetime.now().isoformat()]
+                    )
+                version = conn.execute(
+                    "INSERT INTO data_versions (source_file, allocated_at) VALUES (?, ?)",
+                    [source_name, datetime.now().isoformat()]
+                ).lastrowid
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return version
+    
+    def _get_max_stored_version(self) -> int:
+        """Get the highest _data_version in the existing version files from their footers.
+        
+        Unreadable files (e.g. left by a failed write) are skipped with a
+        warning. Raises if version files exist but none yields a version, so
+        a 0 seed is never recorded below the versions already on disk.
+        """
+        import pyarrow.parquet as pq
+        
+        version_files = sorted(self.warehouse_path.glob("*.parquet"))
+        if not version_files:
+            return 0
+        
+        found = []
+        for file_path in version_files:
+            try:
+                metadata = pq.read_metadata(file_path)
+                if "_data_version" not in metadata.schema.names:
+                    continue
+                column_index = metadata.schema.names.index("_data_version")
+                column_stats = [metadata.row_group(i).column(column_index).statistics
+                                for i in range(metadata.num_row_groups)]
+                if all(cs is not None and (cs.has_min_max or cs.num_values == 0) for cs in column_stats):
+                    found.extend(cs.max for cs in column_stats if cs.has_min_max)
+                else:
+                    # Written without statistics: read just this column
+                    found.append(
+                        pl.scan_parquet(file_path).select(pl.col("_data_version").max()).collect().item()
+                    )
+            except Exception as e:
+                print(f"⚠️ Skipping unreadable version file {file_path.name}: {e}")
+        
+        found = [v for v in found if v is not None]
+        if not found:
+            raise RuntimeError(
+                f"Could not determine the highest _data_version from the "
+                f"{len(version_files)} version files in {self.warehouse_path}"
+            )
+        return int(max(found))
     
     def list_versions(self) -> List[Dict]:
-        """List all available data versions."""
+        """List all available data versions.
+        
+        Version files are write-once, so the scan is cached until the
+        warehouse directory's mtime changes (a file added or removed).
+        """
+        dir_mtime = self.warehouse_path.stat().st_mtime_ns
+        if self._versions_cache and self._versions_cache[0] == dir_mtime:
+            return list(self._versions_cache[1])
+        
         versions = []
         
         # Scan warehouse directory for parquet files
@@ -231,15 +366,79 @@ class IcebergManager:
                     "modified": datetime.fromtimestamp(stat.st_mtime)
                 })
         
-        return sorted(versions, key=lambda x: x["created"], reverse=True)
+        versions = sorted(versions, key=lambda x: x["created"], reverse=True)
+        self._versions_cache = (dir_mtime, versions)
+        return list(versions)
+    
+    def version_as_of(self, timestamp: datetime, versions: Optional[List[Dict]] = None) -> Optional[Dict]:
+        """Get the latest version created at or before a timestamp.
+        
+        Mirrors Iceberg's snapshot-as-of-timestamp lookup: the listing is
+        sorted newest first, so a binary search finds the first version that
+        is not newer than the timestamp. Pass ``versions`` to search an
+        already fetched listing.
+        """
+        if versions is None:
+            versions = self.list_versions()
+        
+        index = bisect.bisect_left(versions, True, key=lambda v: v["created"] <= timestamp)
+        return versions[index] if index < len(versions) else None
+    
+    def get_data_at_timestamp(self, timestamp: datetime) -> pl.DataFrame:
+        """Retrieve data as of a timestamp."""
+        version = self.version_as_of(timestamp)
+        if version is None:
+            raise ValueError(f"No data available at timestamp {timestamp}")
+        
+        return self.get_data_at_version(version["file"])
     
     def get_data_at_version(self, version_file: str) -> pl.DataFrame:
         """Retrieve data from a specific version."""
+        return self.scan_at_version(version_file).collect()
+    
+    def scan_at_version(self, version_file: str) -> pl.LazyFrame:
+        """Lazily scan a specific version so filters and projections reach the parquet reader."""
+        return pl.scan_parquet(self.version_path(version_file))
+    
+    def stats_at_version(self, version_file: str) -> Dict:
+        """Get columns, row count and booking date range of a version from its parquet footer.
+        
+        Only the footer is read; the data pages are scanned only when the
+        file was written without Boekdatum statistics.
+        """
+        import pyarrow.parquet as pq
+        
+        file_path = self.version_path(version_file)
+        metadata = pq.read_metadata(file_path)
+        columns = metadata.schema.to_arrow_schema().names
+        stats = {"columns": columns, "rows": metadata.num_rows, "date_min": None, "date_max": None}
+        
+        if "Boekdatum" not in columns:
+            return stats
+        
+        column_index = metadata.schema.names.index("Boekdatum")
+        column_stats = [metadata.row_group(i).column(column_index).statistics
+                        for i in range(metadata.num_row_groups)]
+        
+        # Row groups holding only nulls (num_values counts non-nulls) carry no min/max
+        if all(cs is not None and (cs.has_min_max or cs.num_values == 0) for cs in column_stats):
+            bounds = [(cs.min, cs.max) for cs in column_stats if cs.has_min_max]
+            date_min = min((lo for lo, _ in bounds), default=None)
+            date_max = max((hi for _, hi in bounds), default=None)
+        else:
+            date_min, date_max = pl.scan_parquet(file_path).select(DATE_RANGE_EXPRESSIONS).collect().row(0)
+        
+        stats["date_min"] = date_min
+        stats["date_max"] = date_max
+        return stats
+    
+    def version_path(self, version_file: str) -> Path:
+        """Resolve a version file name to its path in the warehouse."""
         file_path = self.warehouse_path / version_file
         if not file_path.exists():
             raise FileNotFoundError(f"Version file not found: {version_file}")
             
-        return pl.read_parquet(file_path)
+        return file_path
     
     def get_latest_data(self) -> pl.DataFrame:
         """Get the most recent version of the data."""
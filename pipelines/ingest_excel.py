@@ -7,11 +7,60 @@ Automated pipeline for loading Excel financial data into versioned Iceberg table
 
 import os
 import sys
+import fcntl
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
 from pathlib import Path
 import polars as pl
 from datetime import datetime
 import argparse
-from iceberg_manager import IcebergManager
+from iceberg_manager import IcebergManager, FINANCIAL_TRANSACTION_COLUMNS
+
+# Columns every cleaned Excel export must have (the table schema minus metadata)
+REQUIRED_COLUMNS = [
+    name for name, _ in FINANCIAL_TRANSACTION_COLUMNS if not name.startswith('_')
+]
+
+# Type casts applied to every file, built once at import
+CAST_EXPRESSIONS = [
+    # String columns
+    pl.col("CodeGrootboekrekening").cast(pl.Utf8, strict=False),
+    pl.col("Code").cast(pl.Utf8, strict=False),
+    pl.col("Code1").cast(pl.Utf8, strict=False),
+    pl.col("Code2").cast(pl.Utf8, strict=False),
+    pl.col("Omschrijving").cast(pl.Utf8, strict=False),
+    pl.col("Factuurnummer").cast(pl.Utf8, strict=False),
+    
+    # Low-cardinality labels, dictionary-encoded
+    pl.col("CodeAdministratie").cast(pl.Utf8, strict=False).cast(pl.Categorical),
+    pl.col("NaamAdministratie").cast(pl.Utf8, strict=False).cast(pl.Categorical),
+    pl.col("NaamGrootboekrekening").cast(pl.Utf8, strict=False).cast(pl.Categorical),
+    pl.col("Periode").cast(pl.Utf8, strict=False).cast(pl.Categorical),
+    pl.col("Btwcode").cast(pl.Utf8, strict=False).cast(pl.Categorical),
+    pl.col("Boekingsstatus").cast(pl.Utf8, strict=False).cast(pl.Categorical),
+    
+    # Numeric columns
+    pl.col("Boekingsnummer").cast(pl.Int64, strict=False),
+    pl.col("Nummer").cast(pl.Int64, strict=False),
+    pl.col("Debet").cast(pl.Float64, strict=False),
+    pl.col("Credit").cast(pl.Float64, strict=False),
+    pl.col("Saldo").cast(pl.Float64, strict=False),
+    pl.col("Btwbedrag").cast(pl.Float64, strict=False),
+    
+    # Date column
+    pl.col("Boekdatum").cast(pl.Date, strict=False),
+]
+
+# Rows without a booking date are invalid
+VALID_ROW_FILTER = pl.col("Boekdatum").is_not_null()
+
+
+def _ingest_file_worker(config_path: str, file_path: Path, force: bool) -> bool:
+    """Ingest one file in a worker process with its own manager and connection."""
+    pipeline = ExcelIngestionPipeline(IcebergManager(config_path))
+    return pipeline.ingest_file(file_path, force)
+
 
 class ExcelIngestionPipeline:
     """Pipeline for ingesting Excel files into Iceberg tables."""
@@ -31,13 +80,7 @@ class ExcelIngestionPipeline:
     
     def validate_excel_schema(self, df: pl.DataFrame, file_path: Path) -> bool:
         """Validate that Excel file has the expected schema."""
-        expected_columns = {
-            'CodeAdministratie', 'NaamAdministratie', 'CodeGrootboekrekening',
-            'NaamGrootboekrekening', 'Code', 'Boekingsnummer', 'Boekdatum',
-            'Periode', 'Code1', 'Code2', 'Omschrijving', 'Debet', 'Credit',
-            'Saldo', 'Btwbedrag', 'Btwcode', 'Boekingsstatus', 'Nummer',
-            'Factuurnummer'
-        }
+        expected_columns = set(REQUIRED_COLUMNS)
         
         actual_columns = set(df.columns)
         missing_columns = expected_columns - actual_columns
@@ -57,60 +100,32 @@ class ExcelIngestionPipeline:
     
     def clean_and_transform(self, df: pl.DataFrame, source_file: str) -> pl.DataFrame:
         """Clean and transform Excel data for Iceberg storage."""
+        return self.build_clean_plan(df, source_file).collect()
+    
+    def build_clean_plan(self, df: pl.DataFrame, source_file: str) -> pl.LazyFrame:
+        """Build the lazy cleaning plan for Excel data without executing it."""
         
-        # Ensure required columns exist
-        required_columns = [
-            'CodeAdministratie', 'NaamAdministratie', 'CodeGrootboekrekening',
-            'NaamGrootboekrekening', 'Code', 'Boekingsnummer', 'Boekdatum',
-            'Periode', 'Code1', 'Code2', 'Omschrijving', 'Debet', 'Credit',
-            'Saldo', 'Btwbedrag', 'Btwcode', 'Boekingsstatus', 'Nummer',
-            'Factuurnummer'
-        ]
+        # Build the whole cleaning step as one lazy plan so the casts, metadata
+        # columns and null-date filter run in a single pass over the data
+        lf = df.lazy()
         
         # Add missing columns with null values
-        for col in required_columns:
-            if col not in df.columns:
-                df = df.with_columns(pl.lit(None).alias(col))
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.schema]
+        if missing_columns:
+            lf = lf.with_columns([pl.lit(None).alias(col) for col in missing_columns])
         
         # Clean and cast data types
-        df = df.with_columns([
-            # String columns
-            pl.col("CodeAdministratie").cast(pl.Utf8, strict=False),
-            pl.col("NaamAdministratie").cast(pl.Utf8, strict=False),
-            pl.col("CodeGrootboekrekening").cast(pl.Utf8, strict=False),
-            pl.col("NaamGrootboekrekening").cast(pl.Utf8, strict=False),
-            pl.col("Code").cast(pl.Utf8, strict=False),
-            pl.col("Periode").cast(pl.Utf8, strict=False),
-            pl.col("Code1").cast(pl.Utf8, strict=False),
-            pl.col("Code2").cast(pl.Utf8, strict=False),
-            pl.col("Omschrijving").cast(pl.Utf8, strict=False),
-            pl.col("Btwcode").cast(pl.Utf8, strict=False),
-            pl.col("Boekingsstatus").cast(pl.Utf8, strict=False),
-            pl.col("Factuurnummer").cast(pl.Utf8, strict=False),
-            
-            # Numeric columns
-            pl.col("Boekingsnummer").cast(pl.Int64, strict=False),
-            pl.col("Nummer").cast(pl.Int64, strict=False),
-            pl.col("Debet").cast(pl.Float64, strict=False),
-            pl.col("Credit").cast(pl.Float64, strict=False),
-            pl.col("Saldo").cast(pl.Float64, strict=False),
-            pl.col("Btwbedrag").cast(pl.Float64, strict=False),
-            
-            # Date column
-            pl.col("Boekdatum").cast(pl.Date, strict=False),
-        ])
+        lf = lf.with_columns(CAST_EXPRESSIONS)
         
         # Add metadata columns
-        df = df.with_columns([
+        lf = lf.with_columns([
             pl.lit(datetime.now()).alias("_loaded_at"),
             pl.lit(source_file).alias("_source_file"),
-            pl.lit(int(datetime.now().timestamp())).alias("_data_version")
+            pl.lit(self.iceberg_manager.next_data_version(source_file)).alias("_data_version")
         ])
         
         # Remove rows with null dates (invalid records)
-        df = df.filter(pl.col("Boekdatum").is_not_null())
-        
-        return df
+        return lf.filter(VALID_ROW_FILTER)
     
     def ingest_file(self, file_path: Path, force: bool = False) -> bool:
         """Ingest a single Excel file into Iceberg storage."""
@@ -132,23 +147,24 @@ class ExcelIngestionPipeline:
                 print(f"❌ {file_path.name}: Schema validation failed")
                 return False
             
-            # Clean and transform
+            # Clean, transform and stream to versioned Iceberg storage in one pass
             print(f"🧹 Cleaning and transforming data...")
-            df_clean = self.clean_and_transform(df, file_path.name)
+            clean_plan = self.build_clean_plan(df, file_path.name)
+            
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = f"financial_transactions_{file_path.stem}_{timestamp}.parquet"
+            output_path = self.iceberg_manager.warehouse_path / output_file
+            
+            self.iceberg_manager.write_parquet(clean_plan, output_path)
             
-            valid_rows = len(df_clean)
+            # Row count comes from the parquet footer, not a re-read of the data
+            valid_rows = pl.scan_parquet(output_path).select(pl.len()).collect().item()
             if valid_rows == 0:
+                output_path.unlink()
                 print(f"❌ {file_path.name}: No valid rows after cleaning")
                 return False
             
             print(f"✅ {valid_rows} valid rows after cleaning")
-            
-            # Save to versioned Iceberg storage
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"financial_transactions_{file_path.stem}_{timestamp}.parquet"
-            output_path = self.iceberg_manager.warehouse_path / output_file
-            
-            df_clean.write_parquet(output_path)
             print(f"💾 Saved to: {output_file}")
             
             # Update processing log
@@ -160,27 +176,83 @@ class ExcelIngestionPipeline:
             print(f"❌ Error processing {file_path.name}: {e}")
             return False
     
-    def _is_file_processed(self, file_path: Path) -> bool:
-        """Check if file has already been processed."""
+    def _get_index_connection(self) -> sqlite3.Connection:
+        """Open the processed-files index, creating it from the text log if needed."""
+        index_file = self.iceberg_manager.warehouse_path / "processed_files.db"
+        
+        # SQLite locks across processes, so parallel workers can share the index
+        conn = sqlite3.connect(index_file, timeout=30)
+        # The file also holds the data_versions counter, so it can exist
+        # before the processed_files table does; seed on the missing table
+        is_new = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'processed_files'"
+        ).fetchone() is None
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS processed_files (
+                filename TEXT PRIMARY KEY,
+                output TEXT,
+                row_count INTEGER,
+                processed_at TEXT
+            )
+        """)
+        if is_new:
+            self._import_ingestion_log(conn)
+        return conn
+    
+    def _import_ingestion_log(self, conn: sqlite3.Connection):
+        """Seed the index with files recorded in the legacy ingestion log."""
         log_file = self.iceberg_manager.warehouse_path / "ingestion_log.txt"
         if not log_file.exists():
-            return False
-            
-        with open(log_file, 'r') as f:
-            content = f.read()
-            return file_path.name in content
+            return
+        
+        # Older entries were separated by a literal backslash-n instead of a newline
+        content = log_file.read_text().replace("\\n", "\n")
+        entries = []
+        for line in content.splitlines():
+            parts = [part.strip() for part in line.split('|')]
+            if len(parts) == 4:
+                processed_at, filename, output, rows = parts
+                entries.append((filename, output, int(rows.split()[0]), processed_at))
+        
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO processed_files VALUES (?, ?, ?, ?)", entries)
+    
+    def _is_file_processed(self, file_path: Path) -> bool:
+        """Check if file has already been processed."""
+        with closing(self._get_index_connection()) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM processed_files WHERE filename = ?", [file_path.name]
+            ).fetchone()
+        return row is not None
     
     def _log_processed_file(self, file_path: Path, output_file: str, row_count: int):
-        """Log processed file information."""
-        log_file = self.iceberg_manager.warehouse_path / "ingestion_log.txt"
+        """Record processed file in the index and the human-readable log."""
+        processed_at = datetime.now().isoformat()
+        
+        with closing(self._get_index_connection()) as conn:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO processed_files VALUES (?, ?, ?, ?)",
+                    [file_path.name, output_file, row_count, processed_at]
+                )
         
-        log_entry = f"{datetime.now().isoformat()} | {file_path.name} | {output_file} | {row_count} rows\\n"
+        log_file = self.iceberg_manager.warehouse_path / "ingestion_log.txt"
+        log_entry = f"{processed_at} | {file_path.name} | {output_file} | {row_count} rows\n"
         
+        # Parallel ingestion workers append to the same log
         with open(log_file, 'a') as f:
-            f.write(log_entry)
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(log_entry)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
     
-    def ingest_all(self, force: bool = False) -> dict:
-        """Ingest all Excel files in the raw data directory."""
+    def ingest_all(self, force: bool = False, max_workers: int = None) -> dict:
+        """Ingest all Excel files in the raw data directory.
+        
+        Files are independent, so they are ingested in parallel worker
+        processes (half the available cores by default).
+        """
         excel_files = self.discover_excel_files()
         print(f"🔍 Found {len(excel_files)} Excel files")
         
@@ -191,9 +263,22 @@ class ExcelIngestionPipeline:
             "files": []
         }
         
-        for file_path in excel_files:
-            success = self.ingest_file(file_path, force)
-            
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) // 2)
+        max_workers = min(max_workers, len(excel_files))
+        
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                outcomes = list(executor.map(
+                    _ingest_file_worker,
+                    [self.iceberg_manager.config_path] * len(excel_files),
+                    excel_files,
+                    [force] * len(excel_files)
+                ))
+        else:
+            outcomes = [self.ingest_file(file_path, force) for file_path in excel_files]
+        
+        for file_path, success in zip(excel_files, outcomes):
             if success:
                 results["processed"] += 1
                 results["files"].append({"file": file_path.name, "status": "success"})
@@ -216,12 +301,12 @@ def main():
     parser.add_argument("--file", "-f", help="Process specific file")
     parser.add_argument("--force", action="store_true", help="Force reprocessing of already processed files")
     parser.add_argument("--list", "-l", action="store_true", help="List available versions")
+    parser.add_argument("--workers", "-w", type=int, help="Number of parallel ingestion workers")
     
     args = parser.parse_args()
     
     # Initialize managers
     iceberg_manager = IcebergManager()
-    pipeline = ExcelIngestionPipeline(iceberg_manager)
     
     if args.list:
         versions = iceberg_manager.list_versions()
@@ -230,6 +315,8 @@ def main():
             print(f"  📄 {v['file']} ({v['size_mb']} MB, {v['created']})")
         return
     
+    pipeline = ExcelIngestionPipeline(iceberg_manager)
+    
     if args.file:
         # Process specific file
         file_path = Path(args.file)
@@ -243,7 +330,7 @@ def main():
         pipeline.ingest_file(file_path, args.force)
     else:
         # Process all files
-        pipeline.ingest_all(args.force)
+        pipeline.ingest_all(args.force, args.workers)
 
 
 if __name__ == "__main__":
@@ -5,32 +5,52 @@ Time Travel and Versioning Module
 Provides time travel capabilities for the financial data platform.
 """
 
+import time
 import polars as pl
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 import argparse
-from iceberg_manager import IcebergManager
+from iceberg_manager import IcebergManager, DATE_RANGE_EXPRESSIONS
 
 class TimeTravel:
     """Time travel and versioning operations for financial data."""
     
-    def __init__(self, iceberg_manager: IcebergManager):
-        """Initialize time travel manager."""
+    def __init__(self, iceberg_manager: IcebergManager, staleness_ms: int = 60_000):
+        """Initialize time travel manager.
+        
+        Version listings are reused for up to ``staleness_ms`` milliseconds
+        before the warehouse is checked again.
+        """
         self.iceberg_manager = iceberg_manager
+        self.staleness_ms = staleness_ms
+        self._versions_cache: Optional[tuple] = None
+    
+    def _list_versions(self) -> List[Dict]:
+        """List data versions, reusing a listing younger than staleness_ms."""
+        now = time.monotonic_ns()
+        if self._versions_cache and now - self._versions_cache[0] < self.staleness_ms * 1_000_000:
+            return list(self._versions_cache[1])
         
-    def query_at_timestamp(self, timestamp: datetime) -> pl.DataFrame:
-        """Get data as it existed at a specific timestamp."""
         versions = self.iceberg_manager.list_versions()
+        positions = {v["file"]: i for i, v in enumerate(versions)}
+        self._versions_cache = (now, versions, positions)
+        return list(versions)
+    
+    def _version_position(self, version_file: str) -> Optional[int]:
+        """Position of a version file in the newest-first listing."""
+        self._list_versions()
+        return self._versions_cache[2].get(version_file)
         
-        # Find the latest version at or before the timestamp
-        valid_versions = [v for v in versions if v["created"] <= timestamp]
+    def query_at_timestamp(self, timestamp: datetime) -> pl.DataFrame:
+        """Get data as it existed at a specific timestamp."""
+        target_version = self.iceberg_manager.version_as_of(timestamp, self._list_versions())
         
-        if not valid_versions:
+        if target_version is None:
             raise ValueError(f"No data available at timestamp {timestamp}")
         
-        # Get the latest valid version
-        target_version = max(valid_versions, key=lambda x: x["created"])
         print(f"📅 Using version: {target_version['file']} (created: {target_version['created']})")
         
         return self.iceberg_manager.get_data_at_version(target_version["file"])
@@ -43,72 +63,64 @@ class TimeTravel:
     
     def compare_versions(self, version1: str, version2: str) -> Dict[str, Any]:
         """Compare two data versions and return differences."""
-        df1 = self.iceberg_manager.get_data_at_version(version1)
-        df2 = self.iceberg_manager.get_data_at_version(version2)
+        # Everything compared here is footer metadata, so no data is decoded;
+        # both footers are read concurrently (pyarrow releases the GIL)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            stats1, stats2 = executor.map(self.iceberg_manager.stats_at_version, [version1, version2])
         
         comparison = {
             "version1": {
                 "file": version1,
-                "rows": len(df1),
-                "columns": len(df1.columns)
+                "rows": stats1["rows"],
+                "columns": len(stats1["columns"])
             },
             "version2": {
                 "file": version2,
-                "rows": len(df2),
-                "columns": len(df2.columns)
+                "rows": stats2["rows"],
+                "columns": len(stats2["columns"])
             },
             "differences": {}
         }
         
         # Row count difference
-        row_diff = len(df2) - len(df1)
+        row_diff = stats2["rows"] - stats1["rows"]
         comparison["differences"]["row_change"] = row_diff
         
         # Column differences
-        cols1 = set(df1.columns)
-        cols2 = set(df2.columns)
+        cols1 = set(stats1["columns"])
+        cols2 = set(stats2["columns"])
         
         comparison["differences"]["new_columns"] = list(cols2 - cols1)
         comparison["differences"]["removed_columns"] = list(cols1 - cols2)
         comparison["differences"]["common_columns"] = list(cols1 & cols2)
         
         # Data range comparison (if date columns exist)
-        if "Boekdatum" in df1.columns and "Boekdatum" in df2.columns:
-            date_range1 = self._get_date_range(df1)
-            date_range2 = self._get_date_range(df2)
-            
+        if "Boekdatum" in cols1 and "Boekdatum" in cols2:
             comparison["differences"]["date_ranges"] = {
-                "version1": date_range1,
-                "version2": date_range2
+                "version1": {"min": stats1["date_min"], "max": stats1["date_max"]},
+                "version2": {"min": stats2["date_min"], "max": stats2["date_max"]}
             }
         
         return comparison
     
-    def _get_date_range(self, df: pl.DataFrame) -> Dict[str, str]:
+    def _get_date_range(self, df: pl.DataFrame) -> Dict[str, Optional[date]]:
         """Get date range from a dataframe."""
-        if "Boekdatum" not in df.columns:
+        if "Boekdatum" not in df.schema:
             return {"min": None, "max": None}
             
-        date_stats = df.select([
-            pl.col("Boekdatum").min().alias("min_date"),
-            pl.col("Boekdatum").max().alias("max_date")
-        ]).row(0)
+        date_stats = df.select(DATE_RANGE_EXPRESSIONS).row(0)
         
         return {
-            "min": str(date_stats[0]) if date_stats[0] else None,
-            "max": str(date_stats[1]) if date_stats[1] else None
+            "min": date_stats[0],
+            "max": date_stats[1]
         }
     
     def get_changes_since(self, since_version: str) -> Dict[str, Any]:
         """Get all changes since a specific version."""
-        versions = self.iceberg_manager.list_versions()
+        versions = self._list_versions()
         
         # Find the since_version in the list
-        since_index = None
-        for i, v in enumerate(versions):
-            if v["file"] == since_version:
-                since_index = i
-                break
+        since_index = self._version_position(since_version)
         
         if since_index is None:
             raise ValueError(f"Version not found: {since_version}")
@@ -123,91 +135,201 @@ class TimeTravel:
         }
         
         for v in newer_versions:
-            version_info = {
+            # Row count and date range come from the parquet footer
+            stats = self.iceberg_manager.stats_at_version(v["file"])
+            changes["versions"].append({
                 "file": v["file"],
                 "created": v["created"],
-                "size_mb": v["size_mb"]
-            }
-            
-            # Get basic stats
-            df = self.iceberg_manager.get_data_at_version(v["file"])
-            version_info["rows"] = len(df)
-            version_info["date_range"] = self._get_date_range(df)
-            
-            changes["versions"].append(version_info)
+                "size_mb": v["size_mb"],
+                "rows": stats["rows"],
+                "date_range": {"min": stats["date_min"], "max": stats["date_max"]}
+            })
         
         return changes
     
     def create_consolidated_view(self, version_files: List[str]) -> pl.DataFrame:
         """Create a consolidated view from multiple versions."""
-        dataframes = []
-        
-        for version_file in version_files:
-            df = self.iceberg_manager.get_data_at_version(version_file)
-            dataframes.append(df)
-        
-        # Concatenate all dataframes
-        consolidated = pl.concat(dataframes, how="vertical_relaxed")
+        # Concatenate lazy scans of all versions so the dedup runs in the
+        # streaming engine instead of on a fully materialised union
+        consolidated = pl.concat(
+            [self.iceberg_manager.scan_at_version(version_file) for version_file in version_files],
+            how="vertical_relaxed"
+        )
         
         # Remove duplicates based on business key
         business_key = ["CodeGrootboekrekening", "Boekdatum", "Boekingsnummer"]
-        available_keys = [k for k in business_key if k in consolidated.columns]
+        schema = consolidated.collect_schema()
+        available_keys = [k for k in business_key if k in schema]
         
         if available_keys:
-            # Keep the latest version of each record
-            consolidated = consolidated.sort("_loaded_at", descending=True)
-            consolidated = consolidated.unique(subset=available_keys, keep="first")
+            # Keep the latest version of each record: one hash aggregation
+            # picking the row with the newest _loaded_at, no global sort
+            consolidated = consolidated.group_by(available_keys).agg(
+                pl.all().get(pl.col("_loaded_at").arg_max())
+            ).select(schema.names())
         
-        return consolidated.sort("Boekdatum")
+        return consolidated.sort("Boekdatum").collect(engine="streaming")
     
-    def audit_trail(self, account_code: str = None, date_from: date = None, date_to: date = None) -> pl.DataFrame:
-        """Create an audit trail showing all changes to specific records."""
-        versions = self.iceberg_manager.list_versions()
-        audit_records = []
+    def fast_consolidate(self, version_files: List[str], output_path: Union[str, Path]) -> int:
+        """Append versions into a single parquet file without deduplication.
+        
+        When every version has the same schema, row groups are copied into
+        the output as Arrow tables, skipping the Polars decode/sort/dedup
+        round trip. Otherwise the versions are concatenated lazily and
+        streamed out. Returns the number of rows written.
+        """
+        if not version_files:
+            raise ValueError("No version files to consolidate")
+        
+        import pyarrow.parquet as pq
+        
+        write_options = self.iceberg_manager.get_parquet_write_options()
+        
+        with ExitStack() as stack:
+            parquet_files = [
+                stack.enter_context(pq.ParquetFile(self.iceberg_manager.version_path(version_file)))
+                for version_file in version_files
+            ]
+            schema = parquet_files[0].schema_arrow
+            
+            if all(pf.schema_arrow.equals(schema) for pf in parquet_files[1:]):
+                with pq.ParquetWriter(
+                    output_path,
+                    schema,
+                    compression=write_options['compression'],
+                    compression_level=write_options['compression_level']
+                ) as writer:
+                    for pf in parquet_files:
+                        for i in range(pf.num_row_groups):
+                            writer.write_table(pf.read_row_group(i))
+                return sum(pf.metadata.num_rows for pf in parquet_files)
+        
+        # Schemas diverge: align columns by name and stream the union out
+        pl.concat(
+            [self.iceberg_manager.scan_at_version(version_file) for version_file in version_files],
+            how="diagonal_relaxed"
+        ).sink_parquet(output_path, **write_options)
+        return pl.scan_parquet(output_path).select(pl.len()).collect().item()
+    
+    def _file_can_match(self, path: Path, account_code: str = None, date_from: date = None,
+                        date_to: date = None) -> bool:
+        """Check a version file's row-group statistics against the audit filters."""
+        import pyarrow.parquet as pq
+        
+        metadata = pq.read_metadata(path)
+        names = metadata.schema.names
+        
+        bounds = []
+        if account_code and "CodeGrootboekrekening" in names:
+            bounds.append((names.index("CodeGrootboekrekening"), account_code, account_code))
+        if (date_from or date_to) and "Boekdatum" in names:
+            bounds.append((names.index("Boekdatum"), date_from, date_to))
+        
+        if not bounds:
+            return metadata.num_rows > 0
+        
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            if all(self._stats_overlap(row_group.column(index).statistics, low, high)
+                   for index, low, high in bounds):
+                return True
+        return False
+    
+    @staticmethod
+    def _stats_overlap(stats, low, high) -> bool:
+        """Check whether a column chunk's min/max can contain values in [low, high]."""
+        if stats is None:
+            return True
+        if not stats.has_min_max:
+            # All-null chunks cannot match; otherwise statistics are missing
+            return stats.num_values > 0
+        try:
+            return (low is None or stats.max >= low) and (high is None or stats.min <= high)
+        except TypeError:
+            # Statistics of another type than the filter value, scan to be safe
+            return True
+    
+    def audit_trail(self, account_code: str = None, date_from: date = None, date_to: date = None,
+                    columns: Optional[List[str]] = None) -> pl.DataFrame:
+        """Create an audit trail showing all changes to specific records.
+        
+        ``columns`` limits the output (plus Boekdatum and the version info)
+        so only those columns are read from the version files.
+        """
+        lf = self.audit_trail_lazy(account_code, date_from, date_to, columns)
+        if lf is None:
+            return pl.DataFrame()
         
-        for version in versions:
-            df = self.iceberg_manager.get_data_at_version(version["file"])
+        audit_df = lf.collect(engine="streaming")
+        
+        if len(audit_df) == 0:
+            return pl.DataFrame()
+        
+        return audit_df
+    
+    def audit_trail_lazy(self, account_code: str = None, date_from: date = None,
+                         date_to: date = None, columns: Optional[List[str]] = None) -> Optional[pl.LazyFrame]:
+        """Build the audit trail query without executing it (None if no version can match)."""
+        versions = self._list_versions()
+        
+        # Skip version files whose row-group statistics rule out the filters
+        audit_scans = []
+        for v in versions:
+            path = self.iceberg_manager.version_path(v["file"])
+            if not self._file_can_match(path, account_code, date_from, date_to):
+                continue
             
-            # Apply filters
-            filtered_df = df
+            # Scan each version on its own: versions written before and after
+            # the Categorical cleaning plan disagree on label dtypes, which a
+            # single multi-file scan rejects
+            lf = pl.scan_parquet(path)
+            schema = lf.collect_schema()
             
-            if account_code:
-                if "CodeGrootboekrekening" in df.columns:
-                    filtered_df = filtered_df.filter(
-                        pl.col("CodeGrootboekrekening") == account_code
-                    )
+            # Filters on the scan let parquet row-group statistics skip data
+            # that cannot match
+            if account_code and "CodeGrootboekrekening" in schema:
+                lf = lf.filter(pl.col("CodeGrootboekrekening") == account_code)
             
-            if date_from and "Boekdatum" in df.columns:
-                filtered_df = filtered_df.filter(
-                    pl.col("Boekdatum") >= date_from
-                )
+            if date_from and "Boekdatum" in schema:
+                lf = lf.filter(pl.col("Boekdatum") >= date_from)
             
-            if date_to and "Boekdatum" in df.columns:
-                filtered_df = filtered_df.filter(
-                    pl.col("Boekdatum") <= date_to
-                )
+            if date_to and "Boekdatum" in schema:
+                lf = lf.filter(pl.col("Boekdatum") <= date_to)
+            
+            # Project to the requested columns; the parquet reader then only
+            # decodes these plus the ones the filters need
+            if columns:
+                keep = [col for col in (*columns, "Boekdatum") if col in schema]
+                lf = lf.select(list(dict.fromkeys(keep)))
             
             # Add version info to each record
-            if len(filtered_df) > 0:
-                filtered_df = filtered_df.with_columns([
-                    pl.lit(version["file"]).alias("_version_file"),
-                    pl.lit(version["created"]).alias("_version_created")
-                ])
-                audit_records.append(filtered_df)
-        
-        if not audit_records:
-            return pl.DataFrame()
-        
-        # Combine all audit records
-        audit_df = pl.concat(audit_records, how="vertical_relaxed")
-        
-        return audit_df.sort(["_version_created", "Boekdatum"])
+            audit_scans.append(lf.with_columns([
+                pl.lit(v["file"]).alias("_version_file"),
+                pl.lit(v["created"]).alias("_version_created")
+            ]))
+        
+        if not audit_scans:
+            return None
+        
+        # diagonal_relaxed fills columns a version lacks and unifies
+        # String/Categorical label columns to String
+        return (
+            pl.concat(audit_scans, how="diagonal_relaxed")
+            .sort(["_version_created", "Boekdatum"])
+        )
+
+def _format_date_range(date_range: Dict[str, Optional[date]]) -> Dict[str, Optional[str]]:
+    """Format a typed date range for display."""
+    return {key: str(value) if value else None for key, value in date_range.items()}
 
 
 def main():
     """CLI interface for time travel operations."""
     parser = argparse.ArgumentParser(description="Time travel operations for financial data")
     
+    parser.add_argument("--staleness-ms", type=int, default=60_000,
+                        help="How long a version listing may be reused (milliseconds)")
+    
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
     # Query at date command
@@ -230,6 +352,7 @@ def main():
     audit_parser.add_argument("--from-date", help="Start date (YYYY-MM-DD)")
     audit_parser.add_argument("--to-date", help="End date (YYYY-MM-DD)")
     audit_parser.add_argument("--output", "-o", help="Output file for audit trail")
+    audit_parser.add_argument("--columns", "-c", help="Comma-separated columns to include")
     
     args = parser.parse_args()
     
@@ -239,14 +362,14 @@ def main():
     
     # Initialize managers
     iceberg_manager = IcebergManager()
-    time_travel = TimeTravel(iceberg_manager)
+    time_travel = TimeTravel(iceberg_manager, staleness_ms=args.staleness_ms)
     
     if args.command == "at-date":
-        target_date = datetime.strptime(args.date, "%Y-%m-%d").date()
+        target_date = date.fromisoformat(args.date)
         df = time_travel.query_at_date(target_date)
         
         print(f"📊 Data at {target_date}: {len(df)} rows")
-        print(f"🗓️  Date range: {time_travel._get_date_range(df)}")
+        print(f"🗓️  Date range: {_format_date_range(time_travel._get_date_range(df))}")
         
         if args.output:
             df.write_parquet(args.output)
@@ -260,6 +383,8 @@ def main():
         print(f"Version 2: {comparison['version2']}")
         print(f"\\n🔍 Differences:")
         for key, value in comparison["differences"].items():
+            if key == "date_ranges":
+                value = {version: _format_date_range(date_range) for version, date_range in value.items()}
             print(f"  {key}: {value}")
     
     elif args.command == "changes":
@@ -273,20 +398,29 @@ def main():
             print(f"  Created: {v['created']}")
             print(f"  Rows: {v['rows']:,}")
             print(f"  Size: {v['size_mb']} MB")
-            print(f"  Date Range: {v['date_range']}")
+            print(f"  Date Range: {_format_date_range(v['date_range'])}")
     
     elif args.command == "audit":
-        date_from = datetime.strptime(args.from_date, "%Y-%m-%d").date() if args.from_date else None
-        date_to = datetime.strptime(args.to_date, "%Y-%m-%d").date() if args.to_date else None
+        date_from = date.fromisoformat(args.from_date) if args.from_date else None
+        date_to = date.fromisoformat(args.to_date) if args.to_date else None
         
-        audit_df = time_travel.audit_trail(args.account, date_from, date_to)
-        
-        print(f"\\n🔍 Audit Trail: {len(audit_df)} records")
+        columns = [col.strip() for col in args.columns.split(",")] if args.columns else None
         
         if args.output:
-            audit_df.write_parquet(args.output)
+            # Stream the audit trail to disk without materialising it
+            audit_lf = time_travel.audit_trail_lazy(args.account, date_from, date_to, columns)
+            if audit_lf is None:
+                audit_lf = pl.LazyFrame()
+            audit_lf.sink_parquet(args.output)
+            record_count = pl.scan_parquet(args.output).select(pl.len()).collect().item()
+            
+            print(f"\\n🔍 Audit Trail: {record_count} records")
             print(f"💾 Audit trail saved to: {args.output}")
         else:
+            audit_df = time_travel.audit_trail(args.account, date_from, date_to, columns)
+            
+            print(f"\\n🔍 Audit Trail: {len(audit_df)} records")
+            
             # Show summary
             if len(audit_df) > 0:
                 versions = audit_df.select("_version_file").unique().sort("_version_file")
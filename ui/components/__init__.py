@@ -12,7 +12,8 @@ from .ui_components import (
 )
 
 from .table_components import (
-    create_bulma_table
+    create_bulma_table,
+    create_paginated_table
 )
 
 __all__ = [
@@ -21,5 +22,6 @@ __all__ = [
     'create_lightdash_cards',
     'create_enhanced_button',
     'create_bulma_date_filter',
-    'create_bulma_table'
+    'create_bulma_table',
+    'create_paginated_table'
 ]
\ No newline at end of file
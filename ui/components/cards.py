@@ -9,6 +9,17 @@ from nicegui import ui
 from config.constants import Styles, UIConfig, ErrorMessages, get_button_style
 from utils.error_handling import safe_ui_operation
 
+# Status item rendering, built once at import
+STATUS_ICON_STYLE = 'font-size: 0.75rem; flex-shrink: 0; margin-top: 2px;'
+STATUS_ICON_STYLES = {
+    'fa-check-circle': f'{STATUS_ICON_STYLE} color: #28a745;',  # Green for success
+    'fa-exclamation-triangle': f'{STATUS_ICON_STYLE} color: #ffc107;',  # Yellow/orange for warning
+    'fa-times-circle': f'{STATUS_ICON_STYLE} color: #dc3545;',  # Red for error
+    'fa-info-circle': f'{STATUS_ICON_STYLE} color: #17a2b8;',  # Blue for info
+}
+STATUS_ROW_CLASSES = 'gap-2 items-start mb-0.5 w-full'
+STATUS_TEXT_STYLE = f'{Styles.SMALL_TEXT_STYLE} word-wrap: break-word; line-height: 1.3;'
+
 
 class BaseCard:
     """Base class for all card components."""
@@ -72,21 +83,15 @@ class AdminCard(BaseCard):
         for item in self.status_items:
             icon = item.get('icon', '')
             text = item.get('text', '')
-            with ui.row().classes('gap-2 items-start mb-0.5 w-full'):
+            with ui.row().classes(STATUS_ROW_CLASSES):
                 if icon:
                     # Apply colors based on icon type
-                    icon_color = ''
-                    if 'fa-check-circle' in icon:
-                        icon_color = 'color: #28a745;'  # Green for success
-                    elif 'fa-exclamation-triangle' in icon:
-                        icon_color = 'color: #ffc107;'  # Yellow/orange for warning
-                    elif 'fa-times-circle' in icon:
-                        icon_color = 'color: #dc3545;'  # Red for error
-                    elif 'fa-info-circle' in icon:
-                        icon_color = 'color: #17a2b8;'  # Blue for info
-                    
-                    ui.html(f'<i class="{icon}"></i>', sanitize=False).style(f'font-size: 0.75rem; flex-shrink: 0; margin-top: 2px; {icon_color}')
-                ui.label(text).style(f'{Styles.SMALL_TEXT_STYLE} word-wrap: break-word; line-height: 1.3;').classes('flex-grow')
+                    icon_style = next(
+                        (style for name, style in STATUS_ICON_STYLES.items() if name in icon),
+                        STATUS_ICON_STYLE
+                    )
+                    ui.html(f'<i class="{icon}"></i>', sanitize=False).style(icon_style)
+                ui.label(text).style(STATUS_TEXT_STYLE).classes('flex-grow')
     
     def _create_buttons_section(self):
         """Create the buttons section."""
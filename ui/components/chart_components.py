@@ -3,20 +3,127 @@ Chart components for the Financial Data Platform.
 Centralized chart creation using Plotly for data visualization.
 """
 
-from typing import List, Dict, Any, Optional
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import json
+from collections import Counter, OrderedDict
+from typing import Callable, List, Dict, Any, Optional
+import polars as pl
 from nicegui import ui
 
 from config.constants import UIConfig, ErrorMessages
 from utils.error_handling import safe_ui_operation, log_performance
 
+# Built dashboard figures, keyed on a fingerprint of the chart data
+CHART_CACHE_SIZE = 8
+_chart_cache: "OrderedDict[int, str]" = OrderedDict()
+_sample_figure_json: Optional[str] = None
+
+
+def _chart_data_fingerprint(aggregates: Dict[str, Dict[str, List]]) -> Optional[int]:
+    """Hash the grouped chart data, or None if it cannot be serialised."""
+    try:
+        return hash(json.dumps(aggregates, sort_keys=True, default=str))
+    except (TypeError, ValueError):
+        return None
+
+
+def aggregate_chart_data(accounts: List[Dict[str, Any]],
+                         transactions: List[Dict[str, Any]]) -> Dict[str, Dict[str, List]]:
+    """Group raw account and transaction rows into the chart result sets.
+
+    Produces the same shape as ``DataAccessLayer.get_chart_aggregates`` for
+    callers that only have row lists at hand.
+    """
+    aggregates = {
+        'balances': {'account_code': [], 'balance': []},
+        'type_counts': {'account_type': [], 'count': []},
+        'daily_volume': {'booking_date': [], 'volume': []},
+        'amount_hist': {'bucket': [], 'count': []},
+    }
+    
+    if accounts:
+        codes, balances = zip(*[
+            (acc.get('account_code', 'Unknown'), acc.get('balance', 0))
+            for acc in accounts[:UIConfig.CHART_TOP_ACCOUNTS]
+        ])
+        aggregates['balances'] = {'account_code': list(codes), 'balance': list(balances)}
+        # Counter keeps first-seen order and counts in C
+        account_types = Counter(acc.get('account_type', 'Other') for acc in accounts)
+        aggregates['type_counts'] = {
+            'account_type': list(account_types),
+            'count': list(account_types.values()),
+        }
+    
+    if transactions:
+        # Amounts go straight into one typed Float64 column, made absolute once
+        # for both the volume sums and the buckets
+        transactions_df = pl.DataFrame({
+            'booking_date': pl.Series([trans.get('booking_date', 'Unknown') for trans in transactions], strict=False),
+            'amount': pl.Series([trans.get('amount', 0) for trans in transactions], dtype=pl.Float64).abs(),
+        })
+        # Group transactions by booking date (first-seen order)
+        daily_volume = transactions_df.group_by('booking_date', maintain_order=True).agg(
+            pl.col('amount').sum().alias('volume')
+        ).head(UIConfig.CHART_DAILY_VOLUME_DAYS)
+        aggregates['daily_volume'] = daily_volume.to_dict(as_series=False)
+        
+        # Bucket all amounts in one vectorized pass: the insertion point of each
+        # amount among the sorted breaks is its range index, left-closed
+        amount_ranges = UIConfig.CHART_AMOUNT_RANGES
+        breaks = pl.Series(UIConfig.CHART_AMOUNT_BREAKS, dtype=pl.Float64)
+        bucket_index = breaks.search_sorted(transactions_df['amount'].drop_nulls(), side='right')
+        bucket_counts = dict(bucket_index.value_counts().iter_rows())
+        aggregates['amount_hist'] = {
+            'bucket': list(amount_ranges),
+            'count': [bucket_counts.get(index, 0) for index in range(len(amount_ranges))],
+        }
+    
+    return aggregates
+
+
+# Fires a 'visible' event on [data-lazy-chart] placeholders once they near the
+# viewport, so charts on hidden tabs or below the fold are never built
+CHART_VIEWPORT_SCRIPT = '''
+<script>
+(() => {
+    const observer = new IntersectionObserver((entries) => {
+        for (const entry of entries) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                entry.target.dispatchEvent(new CustomEvent('visible'));
+            }
+        }
+    }, {rootMargin: '200px'});
+    const watch = () => document.querySelectorAll('[data-lazy-chart]:not([data-observed])').forEach((el) => {
+        el.setAttribute('data-observed', '');
+        observer.observe(el);
+    });
+    new MutationObserver(watch).observe(document.documentElement, {childList: true, subtree: true});
+    document.addEventListener('DOMContentLoaded', watch);
+})();
+</script>
+'''
+ui.add_head_html(CHART_VIEWPORT_SCRIPT, shared=True)
+
+
+def clear_chart_cache() -> None:
+    """Drop cached figures so the next render rebuilds from fresh data."""
+    _chart_cache.clear()
+
 
 class ChartBuilder:
-    """Builder class for creating standardized charts."""
+    """Builder class for creating standardized charts.
+
+    Builds the declarative ``{'data': [...], 'layout': {...}}`` figure dict
+    that plotly.js renders in the browser, so no ``go.Figure`` is created
+    on the server.
+    """
     
     def __init__(self):
-        self.fig = None
+        self.traces: List[Dict[str, Any]] = []
+        self.layout: Dict[str, Any] = {}
+        self._secondary_axes: Dict[tuple, str] = {}
+        self.rows = 0
+        self.cols = 0
         self.height = UIConfig.CHART_HEIGHT
         self.title = ""
     
@@ -32,79 +139,171 @@ class ChartBuilder:
     
     def create_subplots(self, rows: int, cols: int, subplot_titles: List[str] = None) -> 'ChartBuilder':
         """Create subplot structure."""
-        self.fig = make_subplots(
-            rows=rows, 
-            cols=cols,
-            subplot_titles=subplot_titles,
-            specs=[[{"secondary_y": True} for _ in range(cols)] for _ in range(rows)]
-        )
+        self.rows, self.cols = rows, cols
+        self.traces = []
+        self.layout = {'annotations': []}
+        self._secondary_axes: Dict[tuple, str] = {}
+        
+        for index, title in enumerate(subplot_titles or []):
+            if index >= rows * cols:
+                break
+            (x0, x1), (y0, y1) = self._cell_domain(index // cols + 1, index % cols + 1)
+            self.layout['annotations'].append({
+                'text': title, 'showarrow': False,
+                'x': (x0 + x1) / 2, 'y': y1, 'xref': 'paper', 'yref': 'paper',
+                'xanchor': 'center', 'yanchor': 'bottom', 'font': {'size': 16}
+            })
         return self
     
-    def add_bar_chart(self, x_data: List, y_data: List, name: str, row: int = 1, col: int = 1) -> 'ChartBuilder':
-        """Add a bar chart to the figure."""
-        if self.fig is None:
+    def _cell_domain(self, row: int, col: int) -> tuple:
+        """Return the (x, y) paper domains of a subplot cell, row 1 on top."""
+        h_spacing = 0.2 / self.cols
+        v_spacing = 0.3 / self.rows
+        width = (1 - h_spacing * (self.cols - 1)) / self.cols
+        height = (1 - v_spacing * (self.rows - 1)) / self.rows
+        x0 = (col - 1) * (width + h_spacing)
+        y1 = 1 - (row - 1) * (height + v_spacing)
+        return [x0, x0 + width], [y1 - height, y1]
+    
+    def _cartesian_axes(self, row: int, col: int, secondary_y: bool = False) -> Dict[str, str]:
+        """Lay out the x/y axis pair of a cell and return the trace references.
+        
+        A secondary y axis is only added to the layout for cells that ask for one.
+        """
+        if not self.rows:
             self.create_subplots(1, 1)
         
-        self.fig.add_trace(
-            go.Bar(x=x_data, y=y_data, name=name, marker_color='lightblue'),
-            row=row, col=col
-        )
+        index = (row - 1) * self.cols + col
+        suffix = '' if index == 1 else str(index)
+        x_domain, y_domain = self._cell_domain(row, col)
+        self.layout[f'xaxis{suffix}'] = {'domain': x_domain, 'anchor': f'y{suffix}'}
+        self.layout[f'yaxis{suffix}'] = {'domain': y_domain, 'anchor': f'x{suffix}'}
+        
+        if not secondary_y:
+            return {'xaxis': f'x{suffix}', 'yaxis': f'y{suffix}'}
+        
+        # Number secondary axes after the cells so they never collide
+        secondary = self._secondary_axes.get((row, col))
+        if secondary is None:
+            secondary = str(self.rows * self.cols + len(self._secondary_axes) + 1)
+            self._secondary_axes[(row, col)] = secondary
+            self.layout[f'yaxis{secondary}'] = {
+                'anchor': f'x{suffix}', 'overlaying': f'y{suffix}', 'side': 'right'
+            }
+        return {'xaxis': f'x{suffix}', 'yaxis': f'y{secondary}'}
+    
+    def add_bar_chart(self, x_data: List, y_data: List, name: str, row: int = 1, col: int = 1,
+                      secondary_y: bool = False) -> 'ChartBuilder':
+        """Add a bar chart to the figure."""
+        axes = self._cartesian_axes(row, col, secondary_y)
+        self.traces.append({
+            'type': 'bar', 'x': x_data, 'y': y_data, 'name': name,
+            'marker': {'color': 'lightblue'},
+            **axes
+        })
         return self
     
-    def add_line_chart(self, x_data: List, y_data: List, name: str, row: int = 1, col: int = 1) -> 'ChartBuilder':
+    def add_line_chart(self, x_data: List, y_data: List, name: str, row: int = 1, col: int = 1,
+                       secondary_y: bool = False) -> 'ChartBuilder':
         """Add a line chart to the figure."""
-        if self.fig is None:
-            self.create_subplots(1, 1)
-        
-        self.fig.add_trace(
-            go.Scatter(x=x_data, y=y_data, mode='lines+markers', name=name),
-            row=row, col=col
-        )
+        axes = self._cartesian_axes(row, col, secondary_y)
+        self.traces.append({
+            'type': 'scatter', 'x': x_data, 'y': y_data, 'name': name,
+            'mode': 'lines+markers',
+            **axes
+        })
         return self
     
     def add_pie_chart(self, labels: List, values: List, name: str, row: int = 1, col: int = 1) -> 'ChartBuilder':
         """Add a pie chart to the figure."""
-        if self.fig is None:
+        if not self.rows:
             self.create_subplots(1, 1)
         
-        self.fig.add_trace(
-            go.Pie(labels=labels, values=values, name=name),
-            row=row, col=col
-        )
+        x_domain, y_domain = self._cell_domain(row, col)
+        self.traces.append({
+            'type': 'pie', 'labels': labels, 'values': values, 'name': name,
+            'domain': {'x': x_domain, 'y': y_domain}
+        })
         return self
     
-    def build(self) -> go.Figure:
-        """Build and return the final figure."""
-        if self.fig is None:
+    def build(self) -> Dict[str, Any]:
+        """Build and return the final figure dict."""
+        if not self.traces:
             raise ValueError("No chart data added. Use add_* methods first.")
         
-        self.fig.update_layout(
-            height=self.height,
-            showlegend=True,
-            title_text=self.title
-        )
+        return {
+            'data': self.traces,
+            'layout': {
+                **self.layout,
+                'height': self.height,
+                'showlegend': True,
+                'title': {'text': self.title}
+            }
+        }
+
+
+def create_viewport_chart(render: Callable[[], Any], height: int = UIConfig.CHART_HEIGHT) -> ui.element:
+    """
+    Show a skeleton placeholder and build the chart once it scrolls into view.
+    
+    Args:
+        render: Callable creating the chart element in the current context
+        height: Placeholder height in pixels
         
-        return self.fig
+    Returns:
+        Container element that receives the chart
+    """
+    container = ui.element('div').classes('w-full').props('data-lazy-chart')
+    with container:
+        ui.skeleton().classes('w-full').style(f'height: {height}px')
+    
+    def on_visible():
+        container.clear()
+        with container:
+            render()
+    
+    container.on('visible', on_visible, [])
+    return container
 
 
-@log_performance("Financial Charts Creation")
-@safe_ui_operation
-def create_financial_charts(data: Dict[str, List[Dict[str, Any]]]) -> Optional[ui.plotly]:
+def create_financial_charts(data: Dict[str, Any], lazy: bool = True) -> ui.element:
     """
-    Create comprehensive financial charts from data.
+    Create comprehensive financial charts, deferred until they are visible.
     
     Args:
-        data: Dictionary containing accounts, transactions, and files data
+        data: Dictionary with pre-grouped ``chart_aggregates`` or raw
+            accounts and transactions lists
+        lazy: Build immediately instead of waiting for the viewport
         
     Returns:
-        NiceGUI plotly component or None if creation fails
+        Placeholder container, or the chart element when not lazy
     """
-    accounts = data.get('accounts', [])
-    transactions = data.get('transactions', [])
+    if not lazy:
+        return _render_financial_charts(data)
+    return create_viewport_chart(lambda: _render_financial_charts(data))
+
+
+@log_performance("Financial Charts Creation")
+@safe_ui_operation
+def _render_financial_charts(data: Dict[str, Any]) -> Optional['ui.plotly']:
+    """Build the financial dashboard figure and render it."""
+    aggregates = data.get('chart_aggregates') or aggregate_chart_data(
+        data.get('accounts', []), data.get('transactions', [])
+    )
+    balances = aggregates.get('balances', {})
+    daily_volume = aggregates.get('daily_volume', {})
+    type_counts = aggregates.get('type_counts', {})
+    amount_hist = aggregates.get('amount_hist', {})
     
-    if not accounts and not transactions:
+    if not balances.get('account_code') and not daily_volume.get('booking_date'):
         return ui.label(ErrorMessages.NO_DATA_AVAILABLE)
     
+    fingerprint = _chart_data_fingerprint(aggregates)
+    cached = _chart_cache.get(fingerprint) if fingerprint is not None else None
+    if cached is not None:
+        _chart_cache.move_to_end(fingerprint)
+        return ui.plotly(json.loads(cached)).classes('w-full')
+    
     try:
         chart_builder = ChartBuilder().set_height(UIConfig.CHART_HEIGHT).set_title("Financial Analytics Dashboard")
         
@@ -117,54 +316,26 @@ def create_financial_charts(data: Dict[str, List[Dict[str, Any]]]) -> Optional[u
         ])
         
         # Chart 1: Account Balances (Bar Chart)
-        if accounts:
-            account_codes = [acc.get('account_code', 'Unknown') for acc in accounts[:10]]
-            balances = [acc.get('balance', 0) for acc in accounts[:10]]
-            chart_builder.add_bar_chart(account_codes, balances, "Account Balances", 1, 1)
+        if balances.get('account_code'):
+            chart_builder.add_bar_chart(balances['account_code'], balances['balance'], "Account Balances", 1, 1)
         
         # Chart 2: Transaction Volume (Line Chart) 
-        if transactions:
-            # Group transactions by booking date
-            transaction_dates = {}
-            for trans in transactions:
-                date = trans.get('booking_date', 'Unknown')
-                amount = trans.get('amount', 0)
-                if date in transaction_dates:
-                    transaction_dates[date] += abs(amount)
-                else:
-                    transaction_dates[date] = abs(amount)
-            
-            dates = list(transaction_dates.keys())[:10]
-            volumes = list(transaction_dates.values())[:10]
-            chart_builder.add_line_chart(dates, volumes, "Daily Volume", 1, 2)
+        if daily_volume.get('booking_date'):
+            chart_builder.add_line_chart(daily_volume['booking_date'], daily_volume['volume'], "Daily Volume", 1, 2)
         
         # Chart 3: Account Type Distribution (Pie Chart)
-        if accounts:
-            account_types = {}
-            for acc in accounts:
-                acc_type = acc.get('account_type', 'Other')
-                if acc_type in account_types:
-                    account_types[acc_type] += 1
-                else:
-                    account_types[acc_type] = 1
-            
-            type_labels = list(account_types.keys())
-            type_counts = list(account_types.values())
-            chart_builder.add_pie_chart(type_labels, type_counts, "Account Types", 2, 1)
+        if type_counts.get('account_type'):
+            chart_builder.add_pie_chart(type_counts['account_type'], type_counts['count'], "Account Types", 2, 1)
         
         # Chart 4: Transaction Amount Distribution
-        if transactions:
-            amounts = [abs(trans.get('amount', 0)) for trans in transactions]
-            amount_ranges = ['0-100', '100-500', '500-1000', '1000+']
-            range_counts = [
-                len([a for a in amounts if 0 <= a < 100]),
-                len([a for a in amounts if 100 <= a < 500]),
-                len([a for a in amounts if 500 <= a < 1000]),
-                len([a for a in amounts if a >= 1000])
-            ]
-            chart_builder.add_bar_chart(amount_ranges, range_counts, "Amount Distribution", 2, 2)
+        if daily_volume.get('booking_date') and amount_hist.get('bucket'):
+            chart_builder.add_bar_chart(amount_hist['bucket'], amount_hist['count'], "Amount Distribution", 2, 2)
         
         fig = chart_builder.build()
+        if fingerprint is not None:
+            _chart_cache[fingerprint] = json.dumps(fig, default=str)
+            if len(_chart_cache) > CHART_CACHE_SIZE:
+                _chart_cache.popitem(last=False)
         return ui.plotly(fig).classes('w-full')
         
     except Exception as e:
@@ -172,31 +343,34 @@ def create_financial_charts(data: Dict[str, List[Dict[str, Any]]]) -> Optional[u
 
 
 @safe_ui_operation
-def create_plotly_sample() -> Optional[ui.plotly]:
+def create_plotly_sample() -> Optional['ui.plotly']:
     """
     Create a sample Plotly chart for demonstration.
     
     Returns:
         NiceGUI plotly component or None if creation fails
     """
+    global _sample_figure_json
     try:
-        chart_builder = ChartBuilder().set_height(300).set_title("Sample Interactive Chart")
-        chart_builder.create_subplots(1, 1)
-        
-        # Sample data
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
-        revenue = [10000, 12000, 8000, 15000, 18000, 20000]
-        
-        chart_builder.add_line_chart(months, revenue, "Revenue Trend")
+        # The sample data never changes, so build the figure once
+        if _sample_figure_json is None:
+            chart_builder = ChartBuilder().set_height(300).set_title("Sample Interactive Chart")
+            chart_builder.create_subplots(1, 1)
+            
+            # Sample data
+            months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
+            revenue = [10000, 12000, 8000, 15000, 18000, 20000]
+            
+            chart_builder.add_line_chart(months, revenue, "Revenue Trend")
+            _sample_figure_json = json.dumps(chart_builder.build())
         
-        fig = chart_builder.build()
-        return ui.plotly(fig).classes('w-full')
+        return ui.plotly(json.loads(_sample_figure_json)).classes('w-full')
         
     except Exception as e:
         return ui.label(f"Error creating sample chart: {str(e)}")
 
 
-def create_simple_bar_chart(x_data: List, y_data: List, title: str = "Bar Chart") -> ui.plotly:
+def create_simple_bar_chart(x_data: List, y_data: List, title: str = "Bar Chart") -> 'ui.plotly':
     """
     Create a simple bar chart.
     
@@ -215,7 +389,7 @@ def create_simple_bar_chart(x_data: List, y_data: List, title: str = "Bar Chart"
     return ui.plotly(fig).classes('w-full')
 
 
-def create_simple_line_chart(x_data: List, y_data: List, title: str = "Line Chart") -> ui.plotly:
+def create_simple_line_chart(x_data: List, y_data: List, title: str = "Line Chart") -> 'ui.plotly':
     """
     Create a simple line chart.
     
@@ -3,11 +3,13 @@ Lazy loading system for tab content and data.
 Only loads data when tabs are accessed for the first time.
 """
 
-from typing import Dict, Callable, Any, Optional
+import threading
+from typing import Dict, List, Callable, Any, Optional
 from functools import wraps
 from nicegui import ui
 
 from utils.error_boundaries import ErrorBoundary, create_data_error_card, create_loading_placeholder
+from .chart_components import clear_chart_cache
 
 
 class LazyDataLoader:
@@ -18,6 +20,15 @@ class LazyDataLoader:
         self.loading_states: Dict[str, bool] = {}
         self.error_states: Dict[str, str] = {}
         self.loaders: Dict[str, Callable] = {}
+        self._locks_lock = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+        # Bumped by every state change made through the loader's methods
+        self.state_version = 0
+        self._status_cache: Optional[tuple] = None
+    
+    def _touch(self):
+        """Record a loader state change, invalidating cached status."""
+        self.state_version += 1
     
     def register_loader(self, key: str, loader_func: Callable, dependencies: list = None):
         """Register a data loader function for lazy loading."""
@@ -26,6 +37,34 @@ class LazyDataLoader:
             'dependencies': dependencies or [],
             'loaded': False
         }
+        self._touch()
+        # A new or replaced loader can change any key's dependency order
+        for loader in self.loaders.values():
+            loader.pop('load_order', None)
+    
+    def _load_order(self, key: str) -> List[str]:
+        """Return ``key`` and its transitive dependencies, dependencies first."""
+        loader_config = self.loaders[key]
+        if 'load_order' in loader_config:
+            return loader_config['load_order']
+        
+        order: List[str] = []
+        visiting = set()
+        
+        def visit(node: str):
+            if node in order:
+                return
+            if node in visiting:
+                raise ValueError(f"Circular loader dependency involving: {node}")
+            visiting.add(node)
+            for dep_key in self.loaders.get(node, {}).get('dependencies', []):
+                visit(dep_key)
+            visiting.discard(node)
+            order.append(node)
+        
+        visit(key)
+        loader_config['load_order'] = order
+        return order
     
     def get_data(self, key: str, force_reload: bool = False) -> Any:
         """Get data, loading it lazily if not already loaded."""
@@ -38,33 +77,57 @@ class LazyDataLoader:
         if key not in self.loaders:
             raise ValueError(f"No loader registered for key: {key}")
         
-        # Set loading state
-        self.loading_states[key] = True
-        self.error_states.pop(key, None)  # Clear previous errors
+        # Load dependencies first in one flat pass, each outside any other
+        # key's lock so that lock acquisition never nests
+        *dependencies, _ = self._load_order(key)
+        for dep_key in dependencies:
+            if dep_key not in self.loaded_data:
+                if dep_key not in self.loaders:
+                    raise ValueError(f"No loader registered for key: {dep_key}")
+                self._load_one(dep_key)
         
-        try:
-            # Load dependencies first
-            loader_config = self.loaders[key]
-            for dep_key in loader_config['dependencies']:
-                if dep_key not in self.loaded_data:
-                    self.get_data(dep_key)
-            
-            # Execute the loader function
-            with ErrorBoundary('LazyLoader', f'loading {key}', fallback_data=None) as boundary:
-                data = loader_config['func']()
-                
-            if boundary.error:
-                self.error_states[key] = str(boundary.error)
-                return None
-            
-            # Cache the loaded data
-            self.loaded_data[key] = data
-            loader_config['loaded'] = True
+        return self._load_one(key, force_reload)
+    
+    def _load_one(self, key: str, force_reload: bool = False) -> Any:
+        """Run the loader for a single key, ignoring its dependencies."""
+        loader_config = self.loaders[key]
+        
+        with self._get_key_lock(key):
+            # Another thread may have loaded the key while we waited
+            if key in self.loaded_data and not force_reload:
+                return self.loaded_data[key]
             
-            return data
+            # Set loading state
+            self.loading_states[key] = True
+            self.error_states.pop(key, None)  # Clear previous errors
+            self._touch()
             
-        finally:
-            self.loading_states[key] = False
+            try:
+                # Execute the loader function
+                with ErrorBoundary('LazyLoader', f'loading {key}', fallback_data=None) as boundary:
+                    data = loader_config['func']()
+                    
+                if boundary.error:
+                    self.error_states[key] = str(boundary.error)
+                    return None
+                
+                # Cache the loaded data
+                self.loaded_data[key] = data
+                loader_config['loaded'] = True
+                
+                return data
+                
+            finally:
+                self.loading_states[key] = False
+                self._touch()
+    
+    def _get_key_lock(self, key: str) -> threading.Lock:
+        """Return the lock serialising loads of ``key``, creating it on first use."""
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
     
     def is_loading(self, key: str) -> bool:
         """Check if data is currently being loaded."""
@@ -90,6 +153,7 @@ class LazyDataLoader:
             self.error_states.clear()
             for loader in self.loaders.values():
                 loader['loaded'] = False
+        self._touch()
     
     def reload_data(self, key: str):
         """Force reload data for specific key."""
@@ -97,6 +161,11 @@ class LazyDataLoader:
     
     def get_lazy_data_status(self) -> Dict[str, Any]:
         """Get status information about the lazy loader."""
+        # Reuse the last status until a loader method changes state
+        if self._status_cache is not None and self._status_cache[0] == self.state_version:
+            return self._status_cache[1]
+        
+        version = self.state_version
         loaded_keys = [key for key, data in self.loaded_data.items() if data is not None]
         error_keys = list(self.error_states.keys())
         
@@ -109,12 +178,14 @@ class LazyDataLoader:
                 'is_loading': self.loading_states.get(key, False)
             }
         
-        return {
+        status = {
             'total_loaders': len(self.loaders),
             'loaded_count': len(loaded_keys),
             'error_count': len(error_keys),
             'details': details
         }
+        self._status_cache = (version, status)
+        return status
 
 
 class LazyTabContent:
@@ -134,11 +205,14 @@ class LazyTabContent:
         
         try:
             with ErrorBoundary('TabContent', f'loading {self.tab_id}') as boundary:
-                # Clear container and load content
+                # Clear container and load content into it; tab change
+                # handlers run in the tabs' slot, not the panel's
                 if self.container:
                     self.container.clear()
-                
-                self.content_loader()
+                    with self.container:
+                        self.content_loader()
+                else:
+                    self.content_loader()
                 
             if boundary.error:
                 self.error_message = str(boundary.error)
@@ -186,20 +260,18 @@ def lazy_data(key: str, dependencies: list = None):
 
 
 def create_lazy_tab_panel(tab: ui.tab, content_func: Callable) -> ui.tab_panel:
-    """Create a tab panel with lazy content loading."""
+    """Create a tab panel with lazy content loading.
+    
+    The panel's ``lazy_content`` is loaded by whoever watches the parent
+    tabs, see ``TabManager.create_lazy_tab_panel``.
+    """
     
     panel = ui.tab_panel(tab)
-    lazy_content = LazyTabContent(tab.text, content_func)
+    lazy_content = LazyTabContent(tab.props['name'], content_func)
     lazy_content.container = panel
     
-    # Load content when tab becomes active
-    def on_tab_change():
-        # Check if this tab is active
-        if hasattr(tab, 'value') and tab.value:
-            lazy_content.load_content()
-    
-    # Set up tab change listener (this would need to be connected to the actual tab system)
-    panel.on('click', on_tab_change)
+    # Store the content on the panel for the tab change dispatcher
+    panel.lazy_content = lazy_content
     
     return panel
 
@@ -258,7 +330,7 @@ def setup_lazy_loaders():
     
     from services.data_service import (
         get_sorted_accounts, get_limited_transactions, 
-        get_excel_files_data, get_dbt_models_data
+        get_excel_files_data, get_dbt_models_data, get_chart_aggregates
     )
     from utils.error_boundaries import database_boundary, excel_boundary, file_boundary
     
@@ -273,6 +345,11 @@ def setup_lazy_loaders():
         database_boundary('get_transactions', [])(get_limited_transactions)
     )
     
+    lazy_loader.register_loader(
+        'chart_aggregates', 
+        database_boundary('get_chart_aggregates', {})(get_chart_aggregates)
+    )
+    
     lazy_loader.register_loader(
         'excel_files', 
         excel_boundary('scan_files', [])(get_excel_files_data)
@@ -288,6 +365,7 @@ def create_data_refresh_button(data_keys: list, label: str = "Refresh Data"):
     """Create a button to refresh specific data sources."""
     
     def refresh_data():
+        clear_chart_cache()
         for key in data_keys:
             lazy_loader.reload_data(key)
         ui.notify(f"Refreshed {len(data_keys)} data sources", type='positive')
@@ -295,9 +373,18 @@ def create_data_refresh_button(data_keys: list, label: str = "Refresh Data"):
     return ui.button(label, on_click=refresh_data).classes('bg-blue-500 text-white')
 
 
+# Last module-level status, keyed on the loader's state version
+_lazy_data_status: Optional[tuple] = None
+
+
 def get_lazy_data_status() -> Dict[str, Any]:
     """Get status of all lazy-loaded data."""
+    global _lazy_data_status
+    
+    if _lazy_data_status is not None and _lazy_data_status[0] == lazy_loader.state_version:
+        return _lazy_data_status[1]
     
+    version = lazy_loader.state_version
     status = {
         'loaded_count': len(lazy_loader.loaded_data),
         'error_count': len(lazy_loader.error_states),
@@ -313,4 +400,5 @@ def get_lazy_data_status() -> Dict[str, Any]:
             'error_message': lazy_loader.get_error(key)
         }
     
+    _lazy_data_status = (version, status)
     return status
\ No newline at end of file
@@ -3,23 +3,44 @@ Pagination components for tables with large datasets.
 """
 
 from typing import Dict, List, Callable, Optional
+from weakref import WeakValueDictionary
 from nicegui import ui
+from nicegui.binding import BindableProperty
 from config.constants import Styles
 
+# Rows-per-page choices and their select options, built once
+PAGE_SIZE_OPTIONS = (10, 20, 50, 100)
+_PAGE_SIZE_SELECT_OPTIONS = {str(opt): str(opt) for opt in PAGE_SIZE_OPTIONS}
+
 
 class PaginationState:
-    """Manages pagination state for a table."""
+    """Manages pagination state for a table.
+    
+    Page and record counts are bindable, so controls bound to them update
+    in one pass whenever the state changes.
+    """
+    
+    current_page = BindableProperty()
+    page_size = BindableProperty()
+    total_records = BindableProperty()
+    total_pages = BindableProperty()
     
     def __init__(self, page_size: int = 20):
         self.current_page = 1
         self.page_size = page_size
         self.total_records = 0
         self.total_pages = 0
+        self._pages_key = None
+        self._page_info_key = None
+        self._page_info = ""
         
     def update_total_records(self, total: int):
         """Update total records and recalculate total pages."""
         self.total_records = total
-        self.total_pages = max(1, (total + self.page_size - 1) // self.page_size)
+        # Table reloads usually report an unchanged total for the same page size
+        if (total, self.page_size) != self._pages_key:
+            self.total_pages = max(1, -(-total // self.page_size))
+            self._pages_key = (total, self.page_size)
         
         # Ensure current page is valid
         if self.current_page > self.total_pages:
@@ -58,9 +79,14 @@ class PaginationState:
     
     def get_page_info(self) -> str:
         """Get human-readable page information."""
-        start = self.get_offset() + 1
-        end = min(start + self.page_size - 1, self.total_records)
-        return f"Showing {start}-{end} of {self.total_records} records"
+        # Reformat only when the page, page size or total has changed
+        key = (self.current_page, self.page_size, self.total_records)
+        if key != self._page_info_key:
+            start = self.get_offset() + 1
+            end = min(start + self.page_size - 1, self.total_records)
+            self._page_info = f"Showing {start}-{end} of {self.total_records} records"
+            self._page_info_key = key
+        return self._page_info
 
 
 def create_pagination_controls(
@@ -111,7 +137,7 @@ def create_pagination_controls(
     ) as container:
         
         # Left side: Page info
-        page_info = ui.label(pagination_state.get_page_info()).classes(
+        page_info = ui.label().classes(
             'pagination-info has-text-grey'
         ).style('font-size: 0.85rem; font-weight: 500;')
         
@@ -137,7 +163,7 @@ def create_pagination_controls(
                 ui.icon('chevron_left').style('font-size: 16px;')
             
             # Page indicator
-            page_indicator = ui.label(f'{pagination_state.current_page} / {pagination_state.total_pages}').style(
+            page_indicator = ui.label().style(
                 'margin: 0 10px; font-size: 0.85rem; font-weight: 600; min-width: 60px; text-align: center;'
             )
             
@@ -157,23 +183,21 @@ def create_pagination_controls(
             with last_btn:
                 ui.icon('last_page').style('font-size: 16px;')
         
-        # Function to update pagination display
-        def update_pagination_display():
-            """Update the pagination controls based on current state."""
-            page_info.text = pagination_state.get_page_info()
-            page_indicator.text = f'{pagination_state.current_page} / {pagination_state.total_pages}'
-            
-            # Enable/disable buttons based on current page
-            first_btn.enabled = pagination_state.can_go_previous()
-            prev_btn.enabled = pagination_state.can_go_previous()
-            next_btn.enabled = pagination_state.can_go_next()
-            last_btn.enabled = pagination_state.can_go_next()
-        
-        # Store update function on the container for external access
-        container.update_pagination = update_pagination_display
-        
-        # Initial update
-        update_pagination_display()
+        # Bind labels and button states to the pagination state
+        for attribute in ('current_page', 'page_size', 'total_records'):
+            page_info.bind_text_from(pagination_state, attribute,
+                                     backward=lambda _: pagination_state.get_page_info())
+        for attribute in ('current_page', 'total_pages'):
+            page_indicator.bind_text_from(
+                pagination_state, attribute,
+                backward=lambda _: f'{pagination_state.current_page} / {pagination_state.total_pages}'
+            )
+            for button in (next_btn, last_btn):
+                button.bind_enabled_from(pagination_state, attribute,
+                                         backward=lambda _: pagination_state.can_go_next())
+        for button in (first_btn, prev_btn):
+            button.bind_enabled_from(pagination_state, 'current_page',
+                                     backward=lambda _: pagination_state.can_go_previous())
     
     return container
 
@@ -181,7 +205,7 @@ def create_pagination_controls(
 def create_page_size_selector(
     pagination_state: PaginationState,
     on_page_size_change: Callable[[int], None],
-    options: List[int] = [10, 20, 50, 100]
+    options: Optional[List[int]] = None
 ) -> ui.element:
     """
     Create a page size selector dropdown.
@@ -189,7 +213,7 @@ def create_page_size_selector(
     Args:
         pagination_state: Current pagination state
         on_page_size_change: Callback when page size changes
-        options: List of page size options
+        options: List of page size options, PAGE_SIZE_OPTIONS by default
     
     Returns:
         UI element containing page size selector
@@ -210,7 +234,7 @@ def create_page_size_selector(
         
         # Create dropdown
         size_select = ui.select(
-            options={str(opt): str(opt) for opt in options},
+            options=_PAGE_SIZE_SELECT_OPTIONS if options is None else {str(opt): str(opt) for opt in options},
             value=str(pagination_state.page_size),
             on_change=lambda e: change_page_size(int(e.value))
         ).classes('is-small').style('min-width: 80px;')
@@ -218,11 +242,13 @@ def create_page_size_selector(
     return container
 
 
-# Global pagination states for different tables
-pagination_states = {}
+# Global pagination states for different tables. Entries are weak: a state
+# lives as long as the controls and loaders of its table hold it.
+pagination_states: "WeakValueDictionary[str, PaginationState]" = WeakValueDictionary()
 
 def get_pagination_state(table_id: str, page_size: int = 20) -> PaginationState:
     """Get or create pagination state for a table."""
-    if table_id not in pagination_states:
-        pagination_states[table_id] = PaginationState(page_size)
-    return pagination_states[table_id]
\ No newline at end of file
+    state = pagination_states.get(table_id)
+    if state is None:
+        state = pagination_states[table_id] = PaginationState(page_size)
+    return state
\ No newline at end of file
@@ -6,6 +6,8 @@ Provides centralized tab creation and content management.
 from typing import Callable, Dict, Any
 from nicegui import ui
 
+from .lazy_loader import LazyTabContent, create_lazy_tab_panel
+
 
 class TabManager:
     """Manages tab creation and content organization."""
@@ -13,6 +15,8 @@ class TabManager:
     def __init__(self):
         self.tabs = {}
         self.tab_panels = {}
+        self._lazy_contents: Dict[str, LazyTabContent] = {}
+        self._watched_tabs = set()
     
     def create_tabs(self, tab_configs: Dict[str, Dict[str, Any]]) -> Dict[str, ui.tab]:
         """
@@ -63,6 +67,42 @@ class TabManager:
         
         return tab_panel
     
+    def create_lazy_tab_panel(self, tab_key: str, content_func: Callable[[], None]) -> ui.tab_panel:
+        """
+        Create a tab panel whose content is built the first time it is shown.
+        
+        Args:
+            tab_key: Key identifying the tab
+            content_func: Function that creates the tab content
+            
+        Returns:
+            Created tab panel
+        """
+        if tab_key not in self.tabs:
+            raise ValueError(f"Tab '{tab_key}' not found. Create tabs first.")
+        
+        tab = self.tabs[tab_key]
+        tab_panel = create_lazy_tab_panel(tab, content_func)
+        self.tab_panels[tab_key] = tab_panel
+        self._lazy_contents[tab.props['name']] = tab_panel.lazy_content
+        
+        # One value-change handler per tabs element dispatches to all panels
+        if tab.tabs is not None and id(tab.tabs) not in self._watched_tabs:
+            self._watched_tabs.add(id(tab.tabs))
+            tab.tabs.on_value_change(lambda e: self.on_active_change(e.value))
+        
+        if tab.tabs is not None and tab.tabs.value in (tab, tab.props['name']):
+            tab_panel.lazy_content.load_content()
+        
+        return tab_panel
+    
+    def on_active_change(self, value: Any) -> None:
+        """Load the lazy content of the newly active tab, given as tab or name."""
+        name = value.props['name'] if isinstance(value, ui.tab) else value
+        lazy_content = self._lazy_contents.get(name)
+        if lazy_content is not None:
+            lazy_content.load_content()
+    
     def get_tab(self, tab_key: str) -> ui.tab:
         """Get a specific tab by key."""
         return self.tabs.get(tab_key)
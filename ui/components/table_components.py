@@ -3,74 +3,223 @@ Table Components for Financial Data Platform
 Professional Bulma table creation and management.
 """
 
-from typing import Dict, List, Callable, Optional
+import re
+from functools import lru_cache
+from html import escape
+from itertools import islice
+from typing import Dict, Iterable, List, Callable, Optional
 from decimal import Decimal
+from pathlib import Path
 from nicegui import ui
 from .pagination import PaginationState, create_pagination_controls, get_pagination_state
-from config.constants import UIConfig
+from config.constants import UIConfig, ColumnRole, COLUMN_ROLES
+from config.ui_config import COLUMN_DISPLAY_NAMES
 
 
-def create_bulma_table(data: List[Dict], columns: List[str], table_id: str = "bulma-table", show_selection: bool = False) -> ui.html:
-    """Create a professional Bulma table with data."""
-    if not data:
-        return ui.html('<p class="has-text-grey">No data available</p>', sanitize=False)
+# Name-based classification for columns missing from COLUMN_ROLES
+CURRENCY = "€"
+NUMERIC_COL_SUBSTRS = ('amount', 'balance', 'debit', 'credit', 'transactions', 'records_', 'size_')
+NUMERIC_COL_SUFFIXES = ('_mb',)
+CURRENCY_KEYWORDS = ('amount', 'balance', 'debit', 'credit')
+BOLD_COLUMNS = ('account_code', 'booking_number')
+PLAIN_DECIMAL_COLUMNS = ('total_debit', 'total_credit', 'net_balance')
+# The keyword rules above as single alternation scans
+_CURRENCY_COL_RE = re.compile('|'.join(map(re.escape, CURRENCY_KEYWORDS)))
+_NUMERIC_COL_RE = re.compile('|'.join(
+    [re.escape(keyword) for keyword in NUMERIC_COL_SUBSTRS]
+    + [re.escape(suffix) + '$' for suffix in NUMERIC_COL_SUFFIXES]
+))
+
+# Columns used, in order of preference, as the selection checkbox key
+PRIMARY_KEY_COLUMNS = ('filename', 'account_code', 'snapshot_id')
+
+# Pages kept per paginated table
+PAGE_CACHE_SIZE = 8
+
+# Bumped by invalidate_page_caches(); each table drops its cached pages when
+# it sees a newer generation
+_page_cache_generation = 0
+
+# Placeholder markup for tables without rows
+_EMPTY_TABLE_HTML = '<p class="has-text-grey">No data available</p>'
+_NO_DATA_HTML = '<div class="text-grey text-center q-pa-md">No data available</div>'
+_ERROR_HTML_TEMPLATE = '<div class="text-negative text-center q-pa-md">Error loading data: {}</div>'
+
+
+# Static table styling, added to the page head once for all tables
+TABLE_CSS_PATH = Path(__file__).resolve().parent.parent / 'static' / 'bulma-table.css'
+ui.add_css(TABLE_CSS_PATH, shared=True)
+
+
+# Status values rendered with an icon
+STATUS_CELL_HTML = {
+    'Processed': '<span style="color: #28a745;"><i class="fas fa-check-circle"></i> Processed</span>',
+    'Skipped': '<span style="color: #ffc107;"><i class="fas fa-exclamation-triangle"></i> Skipped</span>',
+}
+# Exact value types that get number formatting; a set lookup on type(value)
+# instead of an isinstance chain (bool is listed as it subclasses int)
+NUMERIC_TYPES = frozenset({int, float, bool, Decimal})
+
+
+# Cell class and number format per column role; CURRENCY prefixes the symbol
+ROLE_CELL_CLASSES = {
+    ColumnRole.TEXT: '',
+    ColumnRole.BOLD: 'has-text-weight-semibold',
+    ColumnRole.INTEGER: 'has-text-right',
+    ColumnRole.CURRENCY: 'has-text-right',
+    ColumnRole.NUMERIC: 'has-text-right',
+    ColumnRole.STATUS: '',
+}
+ROLE_NUMBER_FORMATS = {
+    ColumnRole.TEXT: '{:,}',
+    ColumnRole.BOLD: None,
+    ColumnRole.INTEGER: '{:,}',
+    ColumnRole.CURRENCY: '{:,.2f}',
+    ColumnRole.NUMERIC: '{:,.2f}',
+    ColumnRole.STATUS: '{:,}',
+}
+
+
+@lru_cache(maxsize=256)
+def _classify_unknown(col: str) -> ColumnRole:
+    """Derive the role of a column that is not in COLUMN_ROLES from its name."""
+    if col == 'status':
+        return ColumnRole.STATUS
+    if col in BOLD_COLUMNS:
+        return ColumnRole.BOLD
+    if col in PLAIN_DECIMAL_COLUMNS:
+        return ColumnRole.NUMERIC
+    if _CURRENCY_COL_RE.search(col):
+        return ColumnRole.CURRENCY
+    if _NUMERIC_COL_RE.search(col):
+        return ColumnRole.INTEGER
+    return ColumnRole.TEXT
+
+
+def column_role(col: str) -> ColumnRole:
+    """Return the role of ``col``, from COLUMN_ROLES or its name."""
+    role = COLUMN_ROLES.get(col)
+    return _classify_unknown(col) if role is None else role
+
+
+def _escape_text(value) -> str:
+    """Escape a non-numeric cell value, which may be user data, for HTML."""
+    return escape(str(value), quote=False)
+
+
+@lru_cache(maxsize=None)
+def _role_formatter(role: ColumnRole, currency_symbol: str) -> Callable:
+    """Return the function that turns a raw cell value into cell HTML for ``role``.
+    
+    Numbers are formatted directly; anything else is escaped, since the table
+    is rendered with ``sanitize=False``.
+    """
+    number_format = ROLE_NUMBER_FORMATS[role]
+    if role == ColumnRole.CURRENCY:
+        number_format = currency_symbol + number_format
+    if role == ColumnRole.STATUS:
+        def format_status(value):
+            if type(value) in NUMERIC_TYPES:
+                return number_format.format(value)
+            status_html = STATUS_CELL_HTML.get(value) if isinstance(value, str) else None
+            return status_html if status_html is not None else _escape_text(value)
+        return format_status
+    if number_format is None:
+        return lambda value: value if type(value) in NUMERIC_TYPES else _escape_text(value)
+    return lambda value: number_format.format(value) if type(value) in NUMERIC_TYPES else _escape_text(value)
+
+
+# Rendered <th> cells by column name; the set of column names is small and fixed
+_header_html_cache: Dict[str, str] = {}
+
+
+def _header_html(col: str, right_aligned: bool) -> str:
+    """Return the cached header cell for ``col``."""
+    header = _header_html_cache.get(col)
+    if header is None:
+        header_class = 'has-text-right' if right_aligned else ''
+        display_name = COLUMN_DISPLAY_NAMES.get(col) or col.replace('_', ' ').title()
+        header = _header_html_cache[col] = f'<th class="{header_class}">{display_name}</th>'
+    return header
+
+
+def _classify_columns(columns: List[str], currency_symbol: str = CURRENCY) -> tuple:
+    """Classify table columns once per table instead of once per cell.
+    
+    Returns:
+        Tuple of (header_html_map, cell_class_map, formatter_map) where
+        formatter_map holds each column's value formatter
+    """
+    header_html_map = {}
+    cell_class_map = {}
+    formatter_map = {}
+    
+    for col in columns:
+        role = column_role(col)
+        cell_class_map[col] = ROLE_CELL_CLASSES[role]
+        header_html_map[col] = _header_html(col, cell_class_map[col] == 'has-text-right')
+        formatter_map[col] = _role_formatter(role, currency_symbol)
+    
+    return header_html_map, cell_class_map, formatter_map
+
+
+def _first_rows(data: Iterable[Dict], limit: int) -> List[Dict]:
+    """Return at most ``limit`` rows, pulling no more than that from iterators."""
+    if isinstance(data, list) and len(data) <= limit:
+        return data
+    return list(islice(data, limit))
+
+
+def _to_columnar(data: Iterable[Dict], columns: List[str], limit: int) -> Dict[str, List]:
+    """Transpose the first ``limit`` row dicts into one value list per column."""
+    rows = _first_rows(data, limit)
+    return {col: [row.get(col, "") for row in rows] for col in columns}
+
+
+def render_rows(data: Iterable[Dict], columns: List[str], show_selection: bool = False,
+                currency_symbol: str = CURRENCY) -> str:
+    """Render the ``<tr>`` rows of a Bulma table as one HTML string."""
+    _, cell_class_map, formatter_map = _classify_columns(columns, currency_symbol)
+    
+    # Rows are limited for performance (configurable via UIConfig.TABLE_PAGE_SIZE)
+    # and formatted a column at a time, each with its own formatter
+    rows = _first_rows(data, UIConfig.TABLE_PAGE_SIZE)
+    columnar = _to_columnar(rows, columns, UIConfig.TABLE_PAGE_SIZE)
+    value_columns = [list(map(formatter_map[col], columnar[col])) for col in columns]
+    
+    # One <tr> template per render, filled with a single str.format per row
+    cell_templates = ['<td class="' + cell_class_map[col] + '">{}</td>' for col in columns]
+    
+    # Add selection checkbox if needed
+    if show_selection:
+        cell_templates.insert(0, '<td class="has-text-centered"><input type="checkbox" class="row-selector" data-key="{}"></td>')
+        # Rows share one shape, so pick the key column once from the first row
+        pk_key = next((key for key in PRIMARY_KEY_COLUMNS if rows and key in rows[0]), None)
+        value_columns.insert(0, [
+            escape(str(row.get(pk_key, i) if pk_key else i))
+            for i, row in enumerate(rows)
+        ])
+    row_template = "<tr>" + "".join(cell_templates) + "</tr>"
+    
+    # Joined once instead of growing a string
+    row_values = zip(*value_columns) if value_columns else [()] * len(rows)
+    return "".join([row_template.format(*values) for values in row_values])
+
+
+def render_shell(columns: List[str], table_id: str = "bulma-table", show_selection: bool = False,
+                 rows_html: str = "") -> str:
+    """Render the table markup (container and header) around ``rows_html``."""
+    header_html_map, _, _ = _classify_columns(columns)
     
     # Create table headers with appropriate alignment
-    headers_html = ""
+    header_parts = []
     
     # Add selection header if needed
     if show_selection:
-        headers_html += f'<th class="has-text-centered" style="width: 50px;">Select</th>'
+        header_parts.append('<th class="has-text-centered" style="width: 50px;">Select</th>')
     
-    for col in columns:
-        display_name = col.replace('_', ' ').title()
-        # Right-align headers for numeric columns
-        header_class = ""
-        if ('amount' in col or 'balance' in col or 'debit' in col or 'credit' in col or 
-            'transactions' in col or 'records_' in col or 'size_' in col or col.endswith('_mb')):
-            header_class = 'has-text-right'
-        headers_html += f'<th class="{header_class}">{display_name}</th>'
-    
-    # Create table rows (limit for performance, configurable via UIConfig.TABLE_PAGE_SIZE)
-    rows_html = ""
-    for i, row in enumerate(data[:UIConfig.TABLE_PAGE_SIZE]):
-        rows_html += "<tr>"
-        
-        # Add selection checkbox if needed
-        if show_selection:
-            primary_key = row.get('filename', row.get('account_code', row.get('snapshot_id', i)))
-            rows_html += f'<td class="has-text-centered"><input type="checkbox" class="row-selector" data-key="{primary_key}"></td>'
-        
-        for col in columns:
-            value = row.get(col, "")
-            # Format numeric values (now with consistent data types)
-            if col not in ['account_code', 'booking_number']:
-                if isinstance(value, (int, float, Decimal)):
-                    # Special handling: total_debit, total_credit, and net_balance don't get EUR sign
-                    if col in ['total_debit', 'total_credit', 'net_balance']:
-                        value = f"{value:,.2f}"
-                    elif ('amount' in col or 'balance' in col or 'debit' in col or 'credit' in col):
-                        value = f"€{value:,.2f}"
-                    else:
-                        value = f"{value:,}"
-            
-            # Handle status column with icons
-            if col == 'status':
-                if value == 'Processed':
-                    value = '<span style="color: #28a745;"><i class="fas fa-check-circle"></i> Processed</span>'
-                elif value == 'Skipped':
-                    value = '<span style="color: #ffc107;"><i class="fas fa-exclamation-triangle"></i> Skipped</span>'
-            
-            # Add appropriate CSS classes for different data types
-            css_class = ""
-            if ('amount' in col or 'balance' in col or 'debit' in col or 'credit' in col or 
-                'transactions' in col or 'records_' in col or 'size_' in col or col.endswith('_mb')):
-                css_class = 'has-text-right'
-            elif col in ['account_code', 'booking_number']:
-                css_class = 'has-text-weight-semibold'
-                
-            rows_html += f'<td class="{css_class}">{value}</td>'
-        rows_html += "</tr>"
+    header_parts.extend([header_html_map[col] for col in columns])
+    headers_html = "".join(header_parts)
     
     table_html = f'''
     <div class="table-container">
@@ -83,35 +232,36 @@ def create_bulma_table(data: List[Dict], columns: List[str], table_id: str = "bu
             </tbody>
         </table>
     </div>
-    <style>
-        .table-container {{
-            border-radius: 6px;
-            overflow: hidden;
-            border: 1px solid #dbdbdb;
-        }}
-        .table {{
-            font-size: 0.8rem;
-        }}
-        .table thead th {{
-            border-bottom: 2px solid #3273dc;
-            font-weight: 600;
-            font-size: 0.75rem;
-            padding: 0.5em 0.75em;
-        }}
-        .table tbody td {{
-            padding: 0.4em 0.75em;
-            font-size: 0.8rem;
-        }}
-        .table tbody tr:hover {{
-            background-color: #f5f5f5;
-        }}
-        input[type="checkbox"] {{
-            transform: scale(1.1);
-        }}
-    </style>
     '''
     
-    return ui.html(table_html, sanitize=False)
+    return table_html
+
+
+def create_bulma_table(data: Iterable[Dict], columns: List[str], table_id: str = "bulma-table", show_selection: bool = False,
+                       currency_symbol: str = CURRENCY) -> ui.html:
+    """Create a professional Bulma table with data."""
+    rows = _first_rows(data, UIConfig.TABLE_PAGE_SIZE)
+    if not rows:
+        return ui.html(_EMPTY_TABLE_HTML, sanitize=False)
+    
+    rows_html = render_rows(rows, columns, show_selection, currency_symbol)
+    return ui.html(render_shell(columns, table_id, show_selection, rows_html), sanitize=False)
+
+
+def _filter_key() -> tuple:
+    """Return a snapshot of the active source file and filter state selections."""
+    try:
+        from utils.source_filter import source_filter
+        from utils.state_management import get_current_filter_state
+    except ImportError:
+        return ()
+    return source_filter.get_filter_key(), get_current_filter_state().cache_key()
+
+
+def invalidate_page_caches() -> None:
+    """Drop the cached pages of every paginated table, e.g. after a data refresh."""
+    global _page_cache_generation
+    _page_cache_generation += 1
 
 
 def create_paginated_table(
@@ -151,12 +301,43 @@ def create_paginated_table(
         if subtitle:
             ui.label(subtitle).classes('text-caption text-grey q-mb-md')
         
-        # Container for table content
+        # Container for table content; a single html element whose content is
+        # replaced on rebuilds instead of being destroyed and recreated
         table_container = ui.element('div').classes('table-container-wrapper')
+        with table_container:
+            table_html_el = ui.html('', sanitize=False)
         
         # Container for pagination controls
         pagination_container = ui.element('div').classes('pagination-wrapper')
-        pagination_controls = None
+        
+        # Recently shown pages, so paging back does not re-query the database.
+        # The active filters are part of the key so a filter change refetches.
+        # Only non-empty results are kept: data funcs return an empty page as
+        # their fallback when a query fails, which must not stick.
+        page_cache: Dict[tuple, tuple] = {}
+        cache_generation = _page_cache_generation
+        
+        def fetch_page(offset: int, limit: int, filter_key) -> tuple:
+            nonlocal cache_generation
+            if cache_generation != _page_cache_generation:
+                page_cache.clear()
+                cache_generation = _page_cache_generation
+            
+            key = (offset, limit, filter_key)
+            if key in page_cache:
+                # Re-insert so the dict's order stays least recently used first
+                result = page_cache.pop(key)
+                page_cache[key] = result
+                return result
+            
+            result = data_func(offset, limit)
+            if result[0]:
+                if len(page_cache) >= PAGE_CACHE_SIZE:
+                    del page_cache[next(iter(page_cache))]
+                page_cache[key] = result
+            return result
+        
+        card.invalidate_cache = page_cache.clear
         
         def load_page_data(page_number: Optional[int] = None):
             """Load data for the current page."""
@@ -168,33 +349,26 @@ def create_paginated_table(
             
             try:
                 # Get data and total count
-                page_data, total_count = data_func(offset, limit)
+                page_data, total_count = fetch_page(offset, limit, _filter_key())
                 
                 # Update pagination state
                 pagination_state.update_total_records(total_count)
                 
-                # Clear and rebuild table
-                table_container.clear()
-                
-                with table_container:
-                    if page_data:
-                        create_bulma_table(page_data, columns, table_id, show_selection)
-                    else:
-                        ui.label('No data available').classes('text-grey text-center q-pa-md')
+                if not page_data:
+                    table_html_el.content = _NO_DATA_HTML
+                    return
                 
-                # Update pagination controls if they exist
-                if pagination_controls and hasattr(pagination_controls, 'update_pagination'):
-                    # Update existing pagination display
-                    pagination_controls.update_pagination()
+                # Assigning the content keeps the server-side element in step
+                # with the page shown, so reconnects re-send the current rows
+                rows_html = render_rows(page_data, columns, show_selection)
+                table_html_el.content = render_shell(columns, table_id, show_selection, rows_html)
                 
             except Exception as e:
-                table_container.clear()
-                with table_container:
-                    ui.label(f'Error loading data: {str(e)}').classes('text-negative text-center q-pa-md')
+                table_html_el.content = _ERROR_HTML_TEMPLATE.format(escape(str(e)))
         
         # Initial pagination controls
         with pagination_container:
-            pagination_controls = create_pagination_controls(
+            create_pagination_controls(
                 pagination_state,
                 load_page_data,
                 table_id
@@ -3,6 +3,7 @@ UI Components for Financial Data Platform
 Reusable UI components with consistent styling.
 """
 
+from datetime import date
 from typing import Dict, List
 from nicegui import ui
 
@@ -50,6 +51,29 @@ def create_lightdash_cards(card_configs: List[Dict]):
                                      on_click=lambda: ui.notify('Lightdash integration - coming soon!'))
 
 
+def _apply_date_filter(e) -> None:
+    """Store the date range picked in the Bulma date filter."""
+    from utils.state_management import filter_manager
+    
+    try:
+        start_date = date.fromisoformat(e.args['start_date'])
+        end_date = date.fromisoformat(e.args['end_date'])
+    except (KeyError, TypeError, ValueError):
+        ui.notify('Invalid date range', type='warning')
+        return
+    if start_date > end_date:
+        ui.notify('Start date must be before end date', type='warning')
+        return
+    filter_manager.set_date_range(start_date, end_date)
+
+
+def _clear_date_filter(e) -> None:
+    """Drop the date range set through the Bulma date filter."""
+    from utils.state_management import filter_manager
+    
+    filter_manager.update_filters(date_range=None)
+
+
 def create_bulma_date_filter():
     """Create professional date filter with Bulma styling."""
     date_picker_html = '''
@@ -94,19 +118,9 @@ def create_bulma_date_filter():
                     const start = startDate.value;
                     const end = endDate.value;
                     if (start && end) {
-                        // Send date filter to backend
-                        fetch('/apply_date_filter', {
-                            method: 'POST',
-                            headers: {'Content-Type': 'application/json'},
-                            body: JSON.stringify({start_date: start, end_date: end})
-                        }).then(response => response.json())
-                          .then(data => {
-                              if (data.status === 'success') {
-                                  // Notify user and trigger refresh
-                                  alert('Date filter applied: ' + start + ' to ' + end);
-                                  window.location.reload(); // Refresh to show filtered data
-                              }
-                          });
+                        // Send date filter to the server over the websocket;
+                        // the page itself stays loaded
+                        emitEvent('date_filter_applied', {start_date: start, end_date: end});
                         console.log('Date filter applied:', start, 'to', end);
                     } else {
                         alert('Please select both start and end dates');
@@ -118,7 +132,7 @@ def create_bulma_date_filter():
                 clearBtn.addEventListener('click', function() {
                     startDate.value = '';
                     endDate.value = '';
-                    window.location.hash = 'date-filter:clear';
+                    emitEvent('date_filter_cleared');
                     console.log('Date filter cleared');
                 });
             }
@@ -128,5 +142,8 @@ def create_bulma_date_filter():
     # Add JavaScript to body
     ui.add_body_html(f'<script>{date_picker_js}</script>')
     
+    ui.on('date_filter_applied', _apply_date_filter)
+    ui.on('date_filter_cleared', _clear_date_filter)
+    
     # Return HTML
     return ui.html(date_picker_html, sanitize=False)
\ No newline at end of file
@@ -13,6 +13,7 @@ from .app_config import (
 from .ui_config import (
     TRANSACTION_COLUMNS,
     ACCOUNT_COLUMNS,
+    COLUMN_DISPLAY_NAMES,
     create_aggrid_config,
     create_column_def
 )
@@ -24,6 +25,7 @@ __all__ = [
     'TITLE',
     'TRANSACTION_COLUMNS',
     'ACCOUNT_COLUMNS',
+    'COLUMN_DISPLAY_NAMES',
     'create_aggrid_config',
     'create_column_def'
 ]
\ No newline at end of file
@@ -3,6 +3,7 @@ Configuration constants for the FPA application.
 Centralized configuration to improve maintainability.
 """
 
+from enum import IntEnum
 from pathlib import Path
 from typing import Dict, Any
 
@@ -39,6 +40,10 @@ class UIConfig:
     # Chart settings
     CHART_HEIGHT = 600
     CHART_MONTHLY_TRENDS_LIMIT = 12
+    CHART_TOP_ACCOUNTS = 10
+    CHART_DAILY_VOLUME_DAYS = 10
+    CHART_AMOUNT_BREAKS = [100, 500, 1000]
+    CHART_AMOUNT_RANGES = ['0-100', '100-500', '500-1000', '1000+']
     
     # Iframe settings
     IFRAME_WIDTH = "1200px"
@@ -65,6 +70,57 @@ class UIConfig:
     ERROR_COLOR = "#dc3545"
     PRIMARY_COLOR = "#3273dc"
 
+# Table column roles
+class ColumnRole(IntEnum):
+    """How a table column is aligned and formatted."""
+    TEXT = 0       # left aligned, numbers get thousands separators
+    BOLD = 1       # identifiers, shown as-is in bold
+    INTEGER = 2    # right aligned counts
+    CURRENCY = 3   # right aligned amounts with currency symbol
+    NUMERIC = 4    # right aligned amounts without currency symbol
+    STATUS = 5     # processing status with icon
+
+# Roles of the known columns; other columns are classified by name
+COLUMN_ROLES: Dict[str, ColumnRole] = {
+    # Identifiers
+    'account_code': ColumnRole.BOLD,
+    'booking_number': ColumnRole.BOLD,
+    # Transaction amounts
+    'debit_amount': ColumnRole.CURRENCY,
+    'credit_amount': ColumnRole.CURRENCY,
+    'net_amount': ColumnRole.CURRENCY,
+    'balance_amount': ColumnRole.CURRENCY,
+    'vat_amount': ColumnRole.CURRENCY,
+    # Account totals
+    'total_transactions': ColumnRole.INTEGER,
+    'total_debit': ColumnRole.NUMERIC,
+    'total_credit': ColumnRole.NUMERIC,
+    'net_balance': ColumnRole.NUMERIC,
+    # Excel files
+    'size_mb': ColumnRole.INTEGER,
+    'status': ColumnRole.STATUS,
+    # Text
+    'account_name': ColumnRole.TEXT,
+    'account_balance_type': ColumnRole.TEXT,
+    'activity_status': ColumnRole.TEXT,
+    'amount_category': ColumnRole.TEXT,
+    'recency_category': ColumnRole.TEXT,
+    'transaction_id': ColumnRole.TEXT,
+    'transaction_date': ColumnRole.TEXT,
+    'transaction_type': ColumnRole.TEXT,
+    'description': ColumnRole.TEXT,
+    'source_file': ColumnRole.TEXT,
+    'filename': ColumnRole.TEXT,
+    'modified': ColumnRole.TEXT,
+    'n_columns': ColumnRole.TEXT,
+    'n_rows': ColumnRole.TEXT,
+    'name': ColumnRole.TEXT,
+    'type': ColumnRole.TEXT,
+    'path': ColumnRole.TEXT,
+    'dependencies': ColumnRole.TEXT,
+    'sources': ColumnRole.TEXT,
+}
+
 # Data Processing Constants
 class DataConfig:
     """Data processing configuration."""
@@ -72,7 +128,6 @@ class DataConfig:
     DEFAULT_TRANSACTION_LIMIT = 1000
     DEFAULT_ACCOUNT_LIMIT = 50
     EXCEL_PREVIEW_LIMIT = 20
-    AGGREGATION_FETCH_LIMIT = 50000  # Max rows fetched for client-side aggregation
     
     # File size limits (MB)
     MAX_FILE_SIZE_MB = 500
@@ -172,8 +227,8 @@ class DevConfig:
     USE_MOCK_DATA = False
     MOCK_SNAPSHOT_COUNT = 4
 
-def get_table_config(table_type: str = "default") -> Dict[str, Any]:
-    """Get standardized table configuration."""
+def _build_table_config(table_type: str) -> Dict[str, Any]:
+    """Build the table configuration for one table type."""
     base_config = {
         'pagination': True,
         'paginationPageSize': UIConfig.TABLE_PAGE_SIZE,
@@ -206,6 +261,21 @@ def get_table_config(table_type: str = "default") -> Dict[str, Any]:
     
     return base_config
 
+# Table configurations for every known table type, built once at import
+_TABLE_CONFIGS = {
+    table_type: _build_table_config(table_type)
+    for table_type in ('default', 'transactions', 'accounts', 'snapshots')
+}
+
+def get_table_config(table_type: str = "default") -> Dict[str, Any]:
+    """Get standardized table configuration.
+    
+    Returns a copy of the prebuilt configuration, since grid options are
+    typically modified after creation (e.g. ``grid.options['rowData']``).
+    """
+    config = _TABLE_CONFIGS.get(table_type, _TABLE_CONFIGS['default'])
+    return {**config, 'defaultColDef': dict(config['defaultColDef'])}
+
 def get_button_style(button_type: str = "default") -> str:
     """Get standardized button styling."""
     styles = {
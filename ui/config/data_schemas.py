@@ -3,7 +3,9 @@ Data schema definitions for consistent data type handling.
 Defines expected data types for all data sources.
 """
 
+import re
 import polars as pl
+from functools import lru_cache
 from typing import Dict, Any
 
 # Excel file schemas
@@ -115,6 +117,19 @@ ICEBERG_SNAPSHOT_SCHEMA = {
 }
 
 
+# Text columns of the schema, typed by the calamine parser while reading so
+# account codes are never round-tripped through floats. Unlike polars' own
+# schema_overrides (which raise for columns a sheet doesn't have), parser
+# dtypes are matched by name and silently ignored when absent. Dates and
+# numbers are left to inference: forcing them nulls text cells without error.
+EXCEL_PARSER_DTYPES = {
+    col: 'string' for col, dtype in EXCEL_FINANCIAL_SCHEMA.items() if dtype == pl.Utf8
+}
+
+# Day-first formats used in the Dutch exports, plus ISO
+TEXT_DATE_FORMATS = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y')
+
+
 def get_excel_read_options(file_path: str) -> Dict[str, Any]:
     """
     Get standardized options for reading Excel files with proper data types.
@@ -126,11 +141,40 @@ def get_excel_read_options(file_path: str) -> Dict[str, Any]:
         Dictionary of read options for polars.read_excel()
     """
     return {
-        'schema_overrides': EXCEL_FINANCIAL_SCHEMA,
-        'infer_schema_length': 1000,  # Sample more rows for better type inference
+        'engine': 'calamine',
+        'read_options': {'dtypes': dict(EXCEL_PARSER_DTYPES)},
+        # The default 100-row sample; note 0 would read every column as a string
+        'infer_schema_length': 100,
     }
 
 
+def _convert_column(series: pl.Series, dtype: pl.DataType) -> pl.Series:
+    """Convert a column to dtype, keeping it unchanged if any value would be lost."""
+    if series.dtype == pl.Utf8 and dtype in (pl.Date, pl.Datetime):
+        # Text dates: take the first format that parses each value
+        converted = pl.Series(series.name, [None] * len(series), dtype=dtype)
+        for fmt in TEXT_DATE_FORMATS:
+            parsed = series.str.strip_chars().str.to_date(fmt, strict=False)
+            converted = converted.fill_null(parsed.cast(dtype))
+    else:
+        converted = series.cast(dtype, strict=False)
+    
+    if converted.null_count() > series.null_count():
+        return series
+    return converted
+
+
+def _refine_dtypes(df: pl.DataFrame) -> pl.DataFrame:
+    """Bring inferred columns to the schema types where that loses no values."""
+    schema = df.schema
+    converted = [
+        _convert_column(df[col], dtype)
+        for col, dtype in EXCEL_FINANCIAL_SCHEMA.items()
+        if col in schema and schema[col] != dtype
+    ]
+    return df.with_columns(converted) if converted else df
+
+
 def standardize_decimal_columns(df: pl.DataFrame, decimal_columns: list) -> pl.DataFrame:
     """
     Convert Decimal columns to Float64 for consistent handling.
@@ -174,16 +218,20 @@ def validate_schema(df: pl.DataFrame, expected_schema: Dict[str, pl.DataType],
         DataFrame with corrected schema
     """
     validation_errors = []
+    # One schema dict for O(1) lookups, in expected_schema order so messages stay stable
+    df_schema = df.schema
+    mismatched = [
+        (col, df_schema[col], expected_type)
+        for col, expected_type in expected_schema.items()
+        if col in df_schema and df_schema[col] != expected_type
+    ]
     
     if strict:
         # Strict validation - collect all errors before raising
-        for col, expected_type in expected_schema.items():
-            if col in df.columns:
-                actual_type = df[col].dtype
-                if actual_type != expected_type:
-                    validation_errors.append(
-                        f"Column '{col}': found {actual_type}, expected {expected_type}"
-                    )
+        for col, actual_type, expected_type in mismatched:
+            validation_errors.append(
+                f"Column '{col}': found {actual_type}, expected {expected_type}"
+            )
         
         if validation_errors:
             error_msg = f"{source_name} schema validation failed:\n" + "\n".join(validation_errors)
@@ -193,14 +241,13 @@ def validate_schema(df: pl.DataFrame, expected_schema: Dict[str, pl.DataType],
         expressions = []
         cast_errors = []
         
-        for col, expected_type in expected_schema.items():
-            if col in df.columns:
-                try:
-                    expressions.append(
-                        pl.col(col).cast(expected_type, strict=False).alias(col)
-                    )
-                except Exception as e:
-                    cast_errors.append(f"Column '{col}': {str(e)}")
+        for col, _, expected_type in mismatched:
+            try:
+                expressions.append(
+                    pl.col(col).cast(expected_type, strict=False).alias(col)
+                )
+            except Exception as e:
+                cast_errors.append(f"Column '{col}': {str(e)}")
         
         if expressions:
             try:
@@ -220,20 +267,28 @@ def read_excel_with_schema(file_path: str) -> pl.DataFrame:
     try:
         # Try with schema first
         options = get_excel_read_options(file_path)
-        df = pl.read_excel(file_path, **options)
-        return validate_schema(df, EXCEL_FINANCIAL_SCHEMA, strict=False)
+        return _refine_dtypes(pl.read_excel(file_path, **options))
     except Exception as e:
         print(f"Error reading Excel file with schema {file_path}: {e}")
         try:
-            # Fallback to basic read without schema
+            # Fallback to basic read, casting to the schema afterwards
             df = pl.read_excel(file_path)
-            return df
+            return validate_schema(df, EXCEL_FINANCIAL_SCHEMA, strict=False)
         except Exception as e2:
             print(f"Error reading Excel file {file_path}: {e2}")
             # Return empty DataFrame as last resort
             return pl.DataFrame()
 
 
+FINANCIAL_COLUMN_KEYWORDS = ('debit', 'credit', 'balance', 'amount', 'vat')
+_FINANCIAL_COL_RE = re.compile('|'.join(FINANCIAL_COLUMN_KEYWORDS), re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def _is_financial_column(col: str) -> bool:
+    return _FINANCIAL_COL_RE.search(col) is not None
+
+
 def standardize_financial_data(data: list) -> list:
     """
     Standardize financial data from any source to consistent types.
@@ -247,16 +302,18 @@ def standardize_financial_data(data: list) -> list:
     if not data:
         return data
     
-    # Convert to DataFrame for easier processing
-    df = pl.DataFrame(data)
-    
     # Identify financial columns
-    financial_columns = [col for col in df.columns 
-                        if any(keyword in col.lower() 
-                              for keyword in ['debit', 'credit', 'balance', 'amount', 'vat'])]
+    financial_columns = [col for col in data[0] if _is_financial_column(col)]
     
-    # Standardize financial columns to Float64
-    df = standardize_decimal_columns(df, financial_columns)
+    # Rows from DataAccessLayer already carry Float64 money columns; skip the
+    # list -> DataFrame -> list round trip when nothing needs converting
+    if all(row.get(col) is None or type(row.get(col)) is float
+           for row in data for col in financial_columns):
+        return data
     
-    # Convert back to list of dicts
-    return df.to_dicts()
\ No newline at end of file
+    # Build the frame with money columns typed as Float64 up front, so no
+    # separate cast pass is needed before converting back
+    df = pl.from_dicts(
+        data, schema_overrides=dict.fromkeys(financial_columns, pl.Float64)
+    )
+    return df.to_dicts()
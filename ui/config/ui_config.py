@@ -61,4 +61,9 @@ ACCOUNT_COLUMNS = [
     create_column_def('Net Balance', 'net_balance', 150, type='numericColumn'),
     create_column_def('Activity Status', 'activity_status', 120),
     create_column_def('Balance Type', 'account_balance_type', 120),
-]
\ No newline at end of file
+]
+# Bulma table header labels for the known fields, title-cased once at import
+COLUMN_DISPLAY_NAMES = {
+    column['field']: column['field'].replace('_', ' ').title()
+    for column in TRANSACTION_COLUMNS + ACCOUNT_COLUMNS
+}
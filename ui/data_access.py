@@ -5,13 +5,37 @@ Data Access Layer for Financial Data Platform
 Connects NiceGUI application to dbt mart tables and Iceberg versioned data.
 """
 
+import threading
+from contextlib import contextmanager
+
 import duckdb
 import polars as pl
+import polars.selectors as cs
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, date
 import os
 
+# Columns get_filtered_transactions can return; also the allowlist for projections
+FILTERED_TRANSACTION_COLUMNS = [
+    "transaction_id",
+    "account_code",
+    "account_name",
+    "transaction_date",
+    "booking_number",
+    "description",
+    "debit_amount",
+    "credit_amount",
+    "net_amount",
+    "transaction_type",
+    "amount_category",
+    "recency_category",
+    "source_file",
+]
+
+# Columns needed to build a keyset cursor from a returned row
+TRANSACTION_KEY_COLUMNS = ["transaction_id", "transaction_date", "booking_number"]
+
 class DataAccessLayer:
     """Data access layer for the financial data platform."""
     
@@ -19,10 +43,55 @@ class DataAccessLayer:
         """Initialize data access layer."""
         self.dbt_warehouse_path = Path("../data/warehouse/dev.duckdb")
         self.iceberg_warehouse_path = Path("../pipelines/data/iceberg/warehouse")
+        # Long-lived read-only warehouse connection, opened on first use
+        self._dbt_conn: Optional[duckdb.DuckDBPyConnection] = None
+        self._dbt_conn_lock = threading.Lock()
+        self._dbt_conn_released = 0
         
     def get_dbt_connection(self) -> duckdb.DuckDBPyConnection:
-        """Get connection to dbt warehouse."""
-        return duckdb.connect(str(self.dbt_warehouse_path))
+        """Get a cursor on the shared read-only connection to the dbt warehouse.
+
+        The database file and catalog are loaded once; each call gets its own
+        cursor, which is safe to use from its calling thread and cheap to close.
+
+        The shared connection holds a DuckDB file lock for as long as it is
+        open, so no other process can open the warehouse for writing. dbt
+        commands started from the UI run inside dbt_connection_released();
+        a ``dbt run`` from the command line needs the UI stopped first.
+        """
+        with self._dbt_conn_lock:
+            if self._dbt_conn_released:
+                # Another process is writing the warehouse; don't hold its lock
+                return duckdb.connect(str(self.dbt_warehouse_path), read_only=True)
+            if self._dbt_conn is None:
+                conn = duckdb.connect(str(self.dbt_warehouse_path), read_only=True)
+                conn.execute("SET enable_object_cache = true")
+                self._dbt_conn = conn
+            return self._dbt_conn.cursor()
+
+    def close_dbt_connection(self) -> None:
+        """Close the shared warehouse connection; the next query reopens it."""
+        with self._dbt_conn_lock:
+            if self._dbt_conn is not None:
+                self._dbt_conn.close()
+                self._dbt_conn = None
+
+    @contextmanager
+    def dbt_connection_released(self):
+        """Release the warehouse file for the duration of the block.
+
+        DuckDB lets only one process open a database file for writing while no
+        other process holds it, so dbt runs need the shared connection closed.
+        Newer data is visible once the connection is reopened afterwards.
+        """
+        with self._dbt_conn_lock:
+            self._dbt_conn_released += 1
+        self.close_dbt_connection()
+        try:
+            yield
+        finally:
+            with self._dbt_conn_lock:
+                self._dbt_conn_released -= 1
     
     def execute_dbt_query(self, query: str, params: list = None, fetch_all: bool = True) -> Any:
         """Execute query against dbt warehouse."""
@@ -30,23 +99,40 @@ class DataAccessLayer:
             result = conn.execute(query, params or [])
             return result.fetchall() if fetch_all else result.fetchone()
 
-    def query_to_dict_list(self, query: str, params: list = None, apply_source_filter: bool = True) -> List[Dict]:
-        """Execute query and convert results to list of dictionaries."""
-        # Apply source file filtering if enabled
+    def _apply_source_filter(self, query: str, params: list = None, apply_source_filter: bool = True) -> tuple:
+        """Apply source file filtering to a query if enabled."""
         if apply_source_filter:
             try:
                 from utils.source_filter import source_filter
                 query, extra_params = source_filter.apply_filter_to_query(query)
-                params = (params or []) + extra_params
+                return query, (params or []) + extra_params
             except ImportError:
-                params = params or []
-        else:
-            params = params or []
+                pass
+        return query, params or []
+
+    @staticmethod
+    def _to_frame(result: duckdb.DuckDBPyConnection) -> pl.DataFrame:
+        """Export a query result as a typed Polars frame with DECIMAL columns as Float64."""
+        # Casting on the Arrow-backed frame keeps money columns typed once per
+        # column, so callers no longer rebuild a DataFrame just to drop Decimals.
+        return result.pl().with_columns(cs.decimal().cast(pl.Float64))
 
+    def query_to_frame(self, query: str, params: list = None, apply_source_filter: bool = True) -> pl.DataFrame:
+        """Execute query and return the result as a Polars DataFrame."""
+        query, params = self._apply_source_filter(query, params, apply_source_filter)
+
+        # Export through Polars (Arrow-backed) so rows are materialised in a
+        # single columnar pass instead of boxing every cell via fetchall().
         with self.get_dbt_connection() as conn:
-            result = conn.execute(query, params).fetchall()
-            columns = [desc[0] for desc in conn.description]
-            return [dict(zip(columns, row)) for row in result]
+            return self._to_frame(conn.execute(query, params))
+
+    def query_to_dict_list(self, query: str, params: list = None, apply_source_filter: bool = True) -> List[Dict]:
+        """Execute query and convert results to list of dictionaries."""
+        return self.query_to_frame(query, params, apply_source_filter).to_dicts()
+
+    def query_to_columns(self, query: str, params: list = None, apply_source_filter: bool = True) -> Dict[str, List]:
+        """Execute query and return results column-wise as {column: values}."""
+        return self.query_to_frame(query, params, apply_source_filter).to_dict(as_series=False)
     
     # Account Summary Methods
     def get_account_summary(self, limit: int = None, offset: int = 0) -> List[Dict]:
@@ -101,8 +187,8 @@ class DataAccessLayer:
         """
         return self.query_to_dict_list(query, [limit])
     
-    def get_account_activity_breakdown(self) -> List[Dict]:
-        """Get breakdown of accounts by activity status."""
+    def get_account_activity_breakdown(self, columnar: bool = False) -> Union[List[Dict], Dict[str, List]]:
+        """Get breakdown of accounts by activity status (column-wise if columnar)."""
         query = """
         SELECT 
             activity_status,
@@ -113,6 +199,8 @@ class DataAccessLayer:
         GROUP BY activity_status
         ORDER BY account_count DESC
         """
+        if columnar:
+            return self.query_to_columns(query)
         return self.query_to_dict_list(query)
     
     # Transaction Methods
@@ -152,6 +240,67 @@ class DataAccessLayer:
         result = self.execute_dbt_query(query, fetch_all=False)
         return result[0] if result else 0
     
+    def _build_transaction_filters(self,
+                                   years: Optional[List[int]] = None,
+                                   quarters: Optional[List[int]] = None,
+                                   months: Optional[List[int]] = None,
+                                   account_codes: Optional[List[str]] = None,
+                                   amount_categories: Optional[List[str]] = None) -> tuple:
+        """Build a parameterized WHERE clause for mart_transaction_details."""
+        where_conditions = []
+        params: List[Any] = []
+
+        for column, values in (
+            ("transaction_year", years),
+            ("transaction_quarter", quarters),
+            ("transaction_month", months),
+            ("account_code", account_codes),
+            ("amount_category", amount_categories),
+        ):
+            if values:
+                # One list parameter per filter keeps the SQL text the same
+                # whatever the number of selected values
+                where_conditions.append(f"{column} = ANY(?)")
+                params.append(list(values))
+
+        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+        return where_clause, params
+
+    def _filtered_transactions_query(self,
+                                     where_clause: str,
+                                     params: List[Any],
+                                     limit: int,
+                                     offset: int,
+                                     after: Optional[tuple] = None,
+                                     columns: Optional[List[str]] = None) -> tuple:
+        """Build the page query for get_filtered_transactions from a filter clause."""
+        params = list(params)
+        if after is not None:
+            keyset = "(transaction_date, coalesce(booking_number, 0), transaction_id) < (?, ?, ?)"
+            where_clause = f"{where_clause} AND {keyset}" if where_clause else f"WHERE {keyset}"
+            params.extend(after)
+            offset = 0
+        params.extend([limit, offset])
+
+        if columns:
+            unknown = set(columns) - set(FILTERED_TRANSACTION_COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown transaction columns: {sorted(unknown)}")
+            selected = [col for col in FILTERED_TRANSACTION_COLUMNS if col in columns]
+        else:
+            selected = FILTERED_TRANSACTION_COLUMNS
+        select_list = ",\n            ".join(selected)
+
+        query = f"""
+        SELECT
+            {select_list}
+        FROM mart_transaction_details
+        {where_clause}
+        ORDER BY transaction_date DESC, coalesce(booking_number, 0) DESC, transaction_id DESC
+        LIMIT ? OFFSET ?
+        """
+        return query, params
+
     def get_filtered_transactions(self,
                                  years: Optional[List[int]] = None,
                                  quarters: Optional[List[int]] = None,
@@ -159,63 +308,158 @@ class DataAccessLayer:
                                  account_codes: Optional[List[str]] = None,
                                  amount_categories: Optional[List[str]] = None,
                                  limit: int = 1000,
-                                 offset: int = 0) -> List[Dict]:
-        """Get filtered transactions with enhanced filtering."""
-        where_conditions = []
-        params: List[Any] = []
+                                 offset: int = 0,
+                                 after: Optional[tuple] = None,
+                                 columns: Optional[List[str]] = None) -> List[Dict]:
+        """Get filtered transactions with enhanced filtering.
 
-        if years:
-            placeholders = ', '.join(['?' for _ in years])
-            where_conditions.append(f"transaction_year IN ({placeholders})")
-            params.extend(years)
-
-        if quarters:
-            placeholders = ', '.join(['?' for _ in quarters])
-            where_conditions.append(f"transaction_quarter IN ({placeholders})")
-            params.extend(quarters)
+        Passing ``after`` (the transaction_sort_key of the previous page's last
+        row) switches to keyset pagination: rows are located by range instead of
+        skipping ``offset`` rows, so deep pages cost the same as the first.
+        ``columns`` projects the result to the fields the caller actually uses.
+        """
+        where_clause, params = self._build_transaction_filters(
+            years, quarters, months, account_codes, amount_categories
+        )
+        query, params = self._filtered_transactions_query(
+            where_clause, params, limit, offset, after, columns
+        )
+        return self.query_to_dict_list(query, params)
 
-        if months:
-            placeholders = ', '.join(['?' for _ in months])
-            where_conditions.append(f"transaction_month IN ({placeholders})")
-            params.extend(months)
+    @staticmethod
+    def transaction_sort_key(row: Dict) -> tuple:
+        """Keyset cursor for a row returned by get_filtered_transactions."""
+        return (row['transaction_date'], row.get('booking_number') or 0, row['transaction_id'])
 
-        if account_codes:
-            placeholders = ', '.join(['?' for _ in account_codes])
-            where_conditions.append(f"account_code IN ({placeholders})")
-            params.extend(account_codes)
+    def get_filtered_transactions_count(self,
+                                        years: Optional[List[int]] = None,
+                                        quarters: Optional[List[int]] = None,
+                                        months: Optional[List[int]] = None,
+                                        account_codes: Optional[List[str]] = None,
+                                        amount_categories: Optional[List[str]] = None) -> int:
+        """Get count of transactions matching the given filters."""
+        where_clause, params = self._build_transaction_filters(
+            years, quarters, months, account_codes, amount_categories
+        )
+        query = f"SELECT COUNT(*) as count FROM mart_transaction_details {where_clause}"
+        result = self.query_to_dict_list(query, params)
+        return result[0]['count'] if result else 0
+    
+    def get_filtered_transactions_page(self,
+                                       years: Optional[List[int]] = None,
+                                       quarters: Optional[List[int]] = None,
+                                       months: Optional[List[int]] = None,
+                                       account_codes: Optional[List[str]] = None,
+                                       amount_categories: Optional[List[str]] = None,
+                                       limit: int = 1000,
+                                       offset: int = 0,
+                                       after: Optional[tuple] = None,
+                                       columns: Optional[List[str]] = None) -> Tuple[List[Dict], int]:
+        """Get one page of filtered transactions together with the total count.
 
-        if amount_categories:
-            placeholders = ', '.join(['?' for _ in amount_categories])
-            where_conditions.append(f"amount_category IN ({placeholders})")
-            params.extend(amount_categories)
+        The filter clause is built once and bound as parameters to both the
+        COUNT and the page statement, which run on a single connection. The
+        page query is skipped when nothing matches.
+        """
+        where_clause, filter_params = self._build_transaction_filters(
+            years, quarters, months, account_codes, amount_categories
+        )
+        page_query, page_params = self._apply_source_filter(
+            *self._filtered_transactions_query(where_clause, filter_params, limit, offset, after, columns)
+        )
+        count_query, count_params = self._apply_source_filter(
+            f"SELECT COUNT(*) as count FROM mart_transaction_details {where_clause}", filter_params
+        )
 
-        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-        params.extend([limit, offset])
+        with self.get_dbt_connection() as conn:
+            result = conn.execute(count_query, count_params).fetchone()
+            total_count = result[0] if result else 0
+            if not total_count:
+                return [], 0
+            rows = self._to_frame(conn.execute(page_query, page_params)).to_dicts()
+        return rows, total_count
+    
+    def get_filtered_account_summary(self,
+                                     years: Optional[List[int]] = None,
+                                     quarters: Optional[List[int]] = None,
+                                     months: Optional[List[int]] = None,
+                                     account_codes: Optional[List[str]] = None,
+                                     amount_categories: Optional[List[str]] = None,
+                                     limit: Optional[int] = None,
+                                     offset: int = 0) -> Tuple[List[Dict], int]:
+        """Get per-account totals over the filtered transactions, with the account count.
 
+        The grouping runs in DuckDB over every matching transaction, so only
+        one row per account is returned. Rows are ordered by account code;
+        ``limit``/``offset`` page over the accounts.
+        """
+        where_clause, params = self._build_transaction_filters(
+            years, quarters, months, account_codes, amount_categories
+        )
+        # Filter the transaction rows before the GROUP BY is wrapped around them
+        tx_query, params = self._apply_source_filter(f"""
+            SELECT account_code, account_name, transaction_date, debit_amount, credit_amount, net_amount
+            FROM mart_transaction_details
+            {where_clause}
+        """, params)
         query = f"""
         SELECT
-            transaction_id,
             account_code,
-            account_name,
-            transaction_date,
-            booking_number,
-            description,
-            debit_amount,
-            credit_amount,
-            net_amount,
-            transaction_type,
-            amount_category,
-            recency_category,
-            source_file
-        FROM mart_transaction_details
-        {where_clause}
-        ORDER BY transaction_date DESC, booking_number DESC
-        LIMIT ? OFFSET ?
+            arg_max(account_name, transaction_date) AS account_name,
+            COUNT(*) AS total_transactions,
+            coalesce(SUM(debit_amount), 0) AS total_debit,
+            coalesce(SUM(credit_amount), 0) AS total_credit,
+            coalesce(SUM(net_amount), 0) AS net_balance,
+            CASE WHEN SUM(net_amount) > 0 THEN 'Net Debit' ELSE 'Net Credit' END AS account_balance_type,
+            'Active' AS activity_status,
+            COUNT(*) OVER () AS total_count
+        FROM ({tx_query}) AS tx
+        GROUP BY account_code
+        ORDER BY account_code
         """
-        return self.query_to_dict_list(query, params)
-    
+        page_params = params
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            page_params = params + [limit, offset]
+
+        frame = self.query_to_frame(query, page_params, apply_source_filter=False)
+        if frame.is_empty():
+            if limit is None or not offset:
+                return [], 0
+            # Paged past the end: the window count has no row to ride on
+            count = self.query_to_frame(
+                f"SELECT COUNT(DISTINCT account_code) AS count FROM ({tx_query}) AS tx",
+                params, apply_source_filter=False
+            )
+            return [], count["count"][0]
+        total_count = frame["total_count"][0]
+        return frame.drop("total_count").to_dicts(), total_count
+
+    def _source_filter_active(self) -> bool:
+        """Check whether a source file filter currently restricts queries."""
+        try:
+            from utils.source_filter import source_filter
+        except ImportError:
+            return False
+        return source_filter.get_filter_condition() is not None
+
     def get_transaction_stats(self) -> Dict:
-        """Get overall transaction statistics."""
+        """Get overall transaction statistics.
+
+        Unfiltered statistics are read from the single-row
+        mart_transaction_stats table that dbt rebuilds on each refresh; a
+        source file filter falls back to aggregating the transaction mart.
+        """
+        if not self._source_filter_active():
+            try:
+                result = self.query_to_dict_list(
+                    "SELECT * FROM mart_transaction_stats", apply_source_filter=False
+                )
+                if result:
+                    return result[0]
+            except duckdb.CatalogException:
+                pass  # Mart not built yet, aggregate directly
+
         query = """
         SELECT 
             COUNT(*) as total_transactions,
@@ -236,59 +480,158 @@ class DataAccessLayer:
         """Get available data versions for time travel."""
         versions = []
         if self.iceberg_warehouse_path.exists():
-            for file_path in self.iceberg_warehouse_path.glob("*.parquet"):
-                if "financial_transactions" in file_path.name:
-                    stat = file_path.stat()
-                    versions.append({
-                        "file": file_path.name,
-                        "path": str(file_path),
-                        "size_mb": round(stat.st_size / (1024*1024), 2),
-                        "created": datetime.fromtimestamp(stat.st_ctime),
-                        "modified": datetime.fromtimestamp(stat.st_mtime)
-                    })
+            # scandir hands back each entry's stat with the listing, so this is
+            # one pass over the directory instead of a glob plus a stat per file
+            with os.scandir(self.iceberg_warehouse_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if (name.endswith(".parquet") and not name.startswith(".")
+                            and "financial_transactions" in name):
+                        stat = entry.stat()
+                        versions.append({
+                            "file": name,
+                            "path": entry.path,
+                            "size_mb": round(stat.st_size / (1024*1024), 2),
+                            "created": datetime.fromtimestamp(stat.st_ctime),
+                            "modified": datetime.fromtimestamp(stat.st_mtime)
+                        })
         
         return sorted(versions, key=lambda x: x["created"], reverse=True)
     
-    def get_data_at_version(self, version_file: str, limit: int = 1000) -> List[Dict]:
-        """Get data from a specific version."""
+    def get_data_at_version(self, version_file: str, limit: int = 1000,
+                            columns: Optional[List[str]] = None) -> List[Dict]:
+        """Get data from a specific version, optionally only the given columns."""
         file_path = self.iceberg_warehouse_path / version_file
         if not file_path.exists():
             return []
         
-        # Read parquet file and convert to list of dicts
-        df = pl.read_parquet(file_path).limit(limit)
-        return df.to_dicts()
+        # Scan lazily so the row limit and column projection reach the parquet
+        # reader instead of loading the whole snapshot and slicing it
+        lf = pl.scan_parquet(file_path)
+        if columns:
+            lf = lf.select(columns)
+        return lf.head(limit).collect().to_dicts()
     
     # Dashboard Methods
+    ACCOUNT_STATS_QUERY = """
+        SELECT 
+            COUNT(*) as total_accounts,
+            COUNT(CASE WHEN activity_status = 'Active' THEN 1 END) as active_accounts,
+            SUM(CASE WHEN net_balance > 0 THEN net_balance ELSE 0 END) as total_assets,
+            SUM(CASE WHEN net_balance < 0 THEN abs(net_balance) ELSE 0 END) as total_liabilities
+        FROM mart_account_summary
+    """
+
     def get_dashboard_stats(self) -> Dict:
-        """Get key statistics for dashboard."""
-        account_stats = self.execute_dbt_query("""
-            SELECT 
-                COUNT(*) as total_accounts,
-                COUNT(CASE WHEN activity_status = 'Active' THEN 1 END) as active_accounts,
-                SUM(CASE WHEN net_balance > 0 THEN net_balance ELSE 0 END) as total_assets,
-                SUM(CASE WHEN net_balance < 0 THEN abs(net_balance) ELSE 0 END) as total_liabilities
-            FROM mart_account_summary
-        """, fetch_all=False)
-        
-        transaction_stats = self.get_transaction_stats()
+        """Get key statistics for dashboard.
+
+        Without a source file filter the account and transaction statistics
+        are fetched in one round-trip from the summary marts.
+        """
+        account_stats = None
+        transaction_stats = None
+
+        if not self._source_filter_active():
+            try:
+                result = self.query_to_dict_list(f"""
+                    WITH account_stats AS ({self.ACCOUNT_STATS_QUERY})
+                    SELECT * FROM account_stats CROSS JOIN mart_transaction_stats
+                """, apply_source_filter=False)
+                if result:
+                    row = result[0]
+                    account_keys = ("total_accounts", "active_accounts", "total_assets", "total_liabilities")
+                    account_stats = {key: row.pop(key) for key in account_keys}
+                    transaction_stats = row
+            except duckdb.CatalogException:
+                pass  # Stats mart not built yet, query separately
+
+        if account_stats is None:
+            result = self.query_to_dict_list(self.ACCOUNT_STATS_QUERY, apply_source_filter=False)
+            account_stats = result[0] if result else {}
+            transaction_stats = self.get_transaction_stats()
         
         return {
             "accounts": {
-                "total": account_stats[0] if account_stats else 0,
-                "active": account_stats[1] if account_stats else 0,
-                "assets": round(account_stats[2] or 0, 2),
-                "liabilities": round(account_stats[3] or 0, 2)
+                "total": account_stats.get("total_accounts") or 0,
+                "active": account_stats.get("active_accounts") or 0,
+                "assets": round(account_stats.get("total_assets") or 0, 2),
+                "liabilities": round(account_stats.get("total_liabilities") or 0, 2)
             },
             "transactions": transaction_stats
         }
     
-    def get_monthly_trends(self, months: int = 12) -> List[Dict]:
-        """Get monthly transaction trends."""
+    def get_chart_aggregates(self, top_accounts: int = 10, days: int = 10,
+                             amount_breaks: Optional[List[float]] = None,
+                             amount_labels: Optional[List[str]] = None) -> Dict[str, Dict[str, List]]:
+        """Get pre-grouped dashboard chart data, each result set column-wise.
+
+        Returns ``balances`` (largest accounts), ``type_counts`` (accounts per
+        balance type), ``daily_volume`` (absolute amount per day for the most
+        recent ``days``) and ``amount_hist`` (transaction counts per amount
+        range, labelled by ``amount_labels`` and split at ``amount_breaks``).
+        """
+        amount_breaks = amount_breaks or [100, 500, 1000]
+        amount_labels = amount_labels or ['0-100', '100-500', '500-1000', '1000+']
+
+        # Filter the transaction rows once, before any GROUP BY is appended
+        tx_query, tx_params = self._apply_source_filter(
+            "SELECT transaction_date, net_amount FROM mart_transaction_details"
+        )
+        bucket_cases = " ".join("WHEN abs(net_amount) < ? THEN ?" for _ in amount_breaks)
+        bucket_params = [value for pair in zip(amount_breaks, amount_labels) for value in pair]
+        bucket_params += [amount_breaks[-1], amount_labels[-1]]
+
+        queries = {
+            "balances": ("""
+                SELECT account_code, net_balance AS balance
+                FROM mart_account_summary
+                ORDER BY abs(net_balance) DESC
+                LIMIT ?
+            """, [top_accounts]),
+            "type_counts": ("""
+                SELECT account_balance_type AS account_type, COUNT(*) AS count
+                FROM mart_account_summary
+                GROUP BY account_balance_type
+                ORDER BY account_type
+            """, []),
+            "daily_volume": (f"""
+                SELECT * FROM (
+                    SELECT transaction_date AS booking_date, SUM(abs(net_amount)) AS volume
+                    FROM ({tx_query})
+                    GROUP BY transaction_date
+                    ORDER BY transaction_date DESC
+                    LIMIT ?
+                ) ORDER BY booking_date
+            """, tx_params + [days]),
+            "amount_hist": (f"""
+                SELECT CASE {bucket_cases} WHEN abs(net_amount) >= ? THEN ? END AS bucket,
+                       COUNT(*) AS count
+                FROM ({tx_query})
+                GROUP BY bucket
+            """, bucket_params + tx_params),
+        }
+
+        with self.get_dbt_connection() as conn:
+            aggregates = {
+                name: self._to_frame(conn.execute(query, params)).to_dict(as_series=False)
+                for name, (query, params) in queries.items()
+            }
+
+        # Report every range in label order, including empty ones
+        counts = dict(zip(aggregates["amount_hist"]["bucket"], aggregates["amount_hist"]["count"]))
+        aggregates["amount_hist"] = {
+            "bucket": list(amount_labels),
+            "count": [counts.get(label, 0) for label in amount_labels],
+        }
+        return aggregates
+
+    def get_monthly_trends(self, months: int = 12, columnar: bool = False) -> Union[List[Dict], Dict[str, List]]:
+        """Get monthly transaction trends (column-wise if columnar)."""
         query = """
         SELECT
             transaction_year,
             transaction_month,
+            printf('%d-%02d', transaction_year, transaction_month) as period,
             COUNT(*) as transaction_count,
             SUM(debit_amount) as total_debit,
             SUM(credit_amount) as total_credit,
@@ -299,6 +642,8 @@ class DataAccessLayer:
         ORDER BY transaction_year DESC, transaction_month DESC
         LIMIT ?
         """
+        if columnar:
+            return self.query_to_columns(query, [months, months])
         return self.query_to_dict_list(query, [months, months])
     
     # Data Refresh Methods
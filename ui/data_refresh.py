@@ -6,13 +6,19 @@ Handles data ingestion, dbt model refresh, and UI updates.
 """
 
 import asyncio
+import sqlite3
 import subprocess
+from contextlib import closing
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 import sys
 import os
 
+from data_access import data_access
+from services.pagination_service import clear_transaction_cursors
+from components.table_components import invalidate_page_caches
+
 class DataRefreshManager:
     """Manages data refresh workflows."""
     
@@ -118,11 +124,22 @@ class DataRefreshManager:
             
             excel_files = list(raw_data_dir.glob("*.xlsx"))
             
-            # Check ingestion log to see what's been processed
-            log_file = self.pipelines_dir / "data" / "iceberg" / "warehouse" / "ingestion_log.txt"
+            # Check the ingestion index (or the older text log) to see what's been processed
+            warehouse_dir = self.pipelines_dir / "data" / "iceberg" / "warehouse"
+            index_file = warehouse_dir / "processed_files.db"
+            log_file = warehouse_dir / "ingestion_log.txt"
             
             processed_files = set()
-            if log_file.exists():
+            has_index = False
+            if index_file.exists():
+                with closing(sqlite3.connect(index_file)) as conn:
+                    # The file may so far only hold the data version counter
+                    has_index = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'processed_files'"
+                    ).fetchone() is not None
+                    if has_index:
+                        processed_files = {row[0] for row in conn.execute("SELECT filename FROM processed_files")}
+            if not has_index and log_file.exists():
                 with open(log_file, 'r') as f:
                     for line in f:
                         if '|' in line:
@@ -195,14 +212,21 @@ class DataRefreshManager:
         """Run dbt model refresh."""
         try:
             # Run dbt models
-            process = await asyncio.create_subprocess_exec(
-                "uv", "run", "dbt", "run",
-                cwd=self.dbt_dir,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            # dbt needs the warehouse file free of the UI's read-only connection
+            with data_access.dbt_connection_released():
+                process = await asyncio.create_subprocess_exec(
+                    "uv", "run", "dbt", "run",
+                    cwd=self.dbt_dir,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await process.communicate()
             
-            stdout, stderr = await process.communicate()
+            # Keyset cursors and cached table pages point into the old marts,
+            # even after a partial run
+            clear_transaction_cursors()
+            invalidate_page_caches()
             
             if process.returncode == 0:
                 output = stdout.decode()
@@ -236,14 +260,16 @@ class DataRefreshManager:
         """Run dbt data quality tests."""
         try:
             # Run dbt tests
-            process = await asyncio.create_subprocess_exec(
-                "uv", "run", "dbt", "test",
-                cwd=self.dbt_dir,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
+            # dbt needs the warehouse file free of the UI's read-only connection
+            with data_access.dbt_connection_released():
+                process = await asyncio.create_subprocess_exec(
+                    "uv", "run", "dbt", "test",
+                    cwd=self.dbt_dir,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await process.communicate()
             
             output = stdout.decode()
             
@@ -5,6 +5,7 @@ Proof-of-concept with Bulma CSS + UI5 Web Components integration.
 """
 
 import os
+import importlib.util
 import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -14,14 +15,8 @@ import yaml
 import polars as pl
 from nicegui import ui
 
-# Import plotly for analytics
-try:
-    import plotly.graph_objects as go
-    import plotly.express as px
-    from plotly.subplots import make_subplots
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+# Plotly is only imported when the analytics charts are first built
+PLOTLY_AVAILABLE = importlib.util.find_spec("plotly") is not None
 
 # Import our data access layer
 from data_access import data_access
@@ -33,14 +28,17 @@ from components import (
     create_lightdash_cards,
     create_enhanced_button,
     create_bulma_date_filter,
-    create_bulma_table
+    create_bulma_table,
+    create_paginated_table
 )
 from services import (
     get_sorted_accounts,
     get_limited_transactions,
     get_excel_files_data,
-    get_dbt_models_data
+    get_dbt_models_data,
+    get_transactions_paginated
 )
+from services.pagination_service import TRANSACTION_PAGE_COLUMNS
 from utils import (
     get_dbt_version,
     get_data_timestamp,
@@ -107,7 +105,8 @@ def update_grids_and_stats():
             # For filtered view, we need to aggregate accounts from filtered transactions
             if filtered_transactions:
                 df = pl.DataFrame(filtered_transactions)
-                filtered_accounts = df.group_by(["account_code", "account_name"]).agg([
+                filtered_accounts = df.group_by("account_code").agg([
+                    pl.col("account_name").first(),
                     pl.len().alias("total_transactions"),
                     pl.col("debit_amount").sum().alias("total_debit"),
                     pl.col("credit_amount").sum().alias("total_credit"),
@@ -154,15 +153,18 @@ def create_plotly_sample():
     if not PLOTLY_AVAILABLE:
         return ui.label("Plotly not available. Install with: uv add plotly")
     
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
     # Get some sample data for charts
     try:
-        monthly_data = data_access.get_monthly_trends(12)
+        monthly_data = data_access.get_monthly_trends(12, columnar=True)
         
-        if monthly_data:
-            # Convert to format suitable for plotting
-            months = [f"{d['transaction_year']}-{d['transaction_month']:02d}" for d in monthly_data]
-            debits = [d['total_debit'] for d in monthly_data]
-            credits = [d['total_credit'] for d in monthly_data]
+        if monthly_data and monthly_data['period']:
+            # Columns come back ready for plotting, labels formatted in SQL
+            months = monthly_data['period']
+            debits = monthly_data['total_debit']
+            credits = monthly_data['total_credit']
             
             # Create subplots
             fig = make_subplots(
@@ -184,14 +186,14 @@ def create_plotly_sample():
             )
             
             # Transaction volume
-            volumes = [d['transaction_count'] for d in monthly_data]
+            volumes = monthly_data['transaction_count']
             fig.add_trace(
                 go.Bar(x=months, y=volumes, name='Transactions', marker_color='blue'),
                 row=1, col=2
             )
             
             # Net cash flow
-            net_flows = [d['net_amount'] for d in monthly_data]
+            net_flows = monthly_data['net_amount']
             fig.add_trace(
                 go.Bar(x=months, y=net_flows, name='Net Flow', 
                       marker_color=['green' if x > 0 else 'red' for x in net_flows]),
@@ -199,12 +201,10 @@ def create_plotly_sample():
             )
             
             # Pie chart for account activity
-            account_summary = data_access.get_account_activity_breakdown()
-            if account_summary:
-                labels = [item['activity_status'] for item in account_summary]
-                values = [item['account_count'] for item in account_summary]
+            account_summary = data_access.get_account_activity_breakdown(columnar=True)
+            if account_summary and account_summary['activity_status']:
                 fig.add_trace(
-                    go.Pie(labels=labels, values=values, name="Account Activity"),
+                    go.Pie(labels=account_summary['activity_status'], values=account_summary['account_count'], name="Account Activity"),
                     row=2, col=2
                 )
             
@@ -228,12 +228,14 @@ def generate_and_embed_dbt_docs():
         
         # Generate docs
         ui.notify("Generating DBT docs...")
-        result = subprocess.run(
-            ["uv", "run", "dbt", "docs", "generate"],
-            cwd=dbt_dir,
-            capture_output=True,
-            text=True
-        )
+        # docs generate opens the warehouse, so release the UI's read lock on it
+        with data_access.dbt_connection_released():
+            result = subprocess.run(
+                ["uv", "run", "dbt", "docs", "generate"],
+                cwd=dbt_dir,
+                capture_output=True,
+                text=True
+            )
         
         if result.returncode == 0:
             ui.notify("DBT docs generated successfully!")
@@ -362,13 +364,14 @@ def open_dbt_docs_external():
     try:
         dbt_dir = Path("../dbt_project")
         
-        # Generate docs first
-        result = subprocess.run(
-            ["uv", "run", "dbt", "docs", "generate"],
-            cwd=dbt_dir,
-            capture_output=True,
-            text=True
-        )
+        # Generate docs first, with the warehouse released for dbt
+        with data_access.dbt_connection_released():
+            result = subprocess.run(
+                ["uv", "run", "dbt", "docs", "generate"],
+                cwd=dbt_dir,
+                capture_output=True,
+                text=True
+            )
         
         if result.returncode == 0:
             # Start docs server
@@ -536,13 +539,8 @@ with ui.tab_panels(main_tabs, value=dashboard_tab).classes('w-full').style('padd
                     ui.label('Transaction Details').classes('title is-5 mb-3')
                     ui.label('Detailed view of financial transactions').classes('subtitle is-6 has-text-grey mb-4')
                     
-                    # Load initial transactions data
-                    initial_transactions = get_limited_transactions(limit=20)
-                    transaction_columns = ['account_code', 'account_name', 'transaction_date', 'description', 'debit_amount', 'credit_amount', 'net_amount']
-                    create_bulma_table(initial_transactions, transaction_columns, "transactions-table")
-                    
-                    if initial_transactions:
-                        ui.label(f'Showing {len(initial_transactions)} transactions (limited to first 20 rows for performance)').classes('help')
+                    # Page through transactions in DuckDB; only the visible page is fetched
+                    create_paginated_table(get_transactions_paginated, TRANSACTION_PAGE_COLUMNS, "transactions-table")
 
     # ANALYTICS TAB (No changes)
     with ui.tab_panel(analytics_tab):
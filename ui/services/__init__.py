@@ -7,12 +7,14 @@ from .data_service import (
     get_sorted_accounts,
     get_limited_transactions,
     get_excel_files_data,
-    get_dbt_models_data
+    get_dbt_models_data,
+    get_transactions_paginated
 )
 
 __all__ = [
     'get_sorted_accounts',
     'get_limited_transactions', 
     'get_excel_files_data',
-    'get_dbt_models_data'
+    'get_dbt_models_data',
+    'get_transactions_paginated'
 ]
\ No newline at end of file
@@ -17,6 +17,7 @@ from utils.error_boundaries import (
     DataSourceError
 )
 from components.lazy_loader import lazy_data
+from services.pagination_service import get_filtered_paginated_transactions
 
 
 @lazy_data('accounts')
@@ -30,29 +31,12 @@ def get_sorted_accounts() -> List[Dict]:
         
         # If filters are active, get filtered data
         if filter_state.years or filter_state.months or filter_state.quarters:
-            # Get filtered transactions first
-            transactions = data_access.get_filtered_transactions(
+            # Aggregate the filtered transactions to account level in DuckDB
+            accounts, _ = data_access.get_filtered_account_summary(
                 years=list(filter_state.years) if filter_state.years else None,
                 quarters=list(filter_state.quarters) if filter_state.quarters else None,
-                months=list(filter_state.months) if filter_state.months else None,
-                limit=DataConfig.AGGREGATION_FETCH_LIMIT
+                months=list(filter_state.months) if filter_state.months else None
             )
-            
-            if transactions:
-                # Aggregate to account level
-                import polars as pl
-                df = pl.DataFrame(transactions)
-                accounts = df.group_by(["account_code", "account_name"]).agg([
-                    pl.len().alias("total_transactions"),
-                    pl.col("debit_amount").sum().alias("total_debit"),
-                    pl.col("credit_amount").sum().alias("total_credit"),
-                    pl.col("net_amount").sum().alias("net_balance"),
-                ]).with_columns([
-                    pl.when(pl.col("net_balance") > 0).then(pl.lit("Net Debit")).otherwise(pl.lit("Net Credit")).alias("account_balance_type"),
-                    pl.lit("Active").alias("activity_status")
-                ]).to_dicts()
-            else:
-                accounts = []
         else:
             # No filters, get all accounts
             accounts = data_access.get_account_summary()
@@ -102,6 +86,18 @@ def get_limited_transactions(limit: int = 20) -> List[Dict]:
     return transactions or []
 
 
+@lazy_data('chart_aggregates')
+@database_boundary('get_chart_aggregates', fallback={})
+def get_chart_aggregates() -> Dict:
+    """Get dashboard chart data already grouped by the database."""
+    return data_access.get_chart_aggregates(
+        top_accounts=UIConfig.CHART_TOP_ACCOUNTS,
+        days=UIConfig.CHART_DAILY_VOLUME_DAYS,
+        amount_breaks=UIConfig.CHART_AMOUNT_BREAKS,
+        amount_labels=UIConfig.CHART_AMOUNT_RANGES
+    )
+
+
 @lazy_data('excel_files')
 @excel_boundary('scan_directory', fallback=[])
 def get_excel_files_data() -> List[Dict]:
@@ -279,7 +275,10 @@ def get_accounts_paginated(offset: int, limit: int) -> tuple[list, int]:
 
 def get_transactions_paginated(offset: int, limit: int) -> tuple[list, int]:
     """
-    Get paginated transaction data from cached lazy-loaded data.
+    Get paginated transaction data straight from DuckDB.
+    
+    Only the requested page is fetched (LIMIT/OFFSET), so the cost of a page
+    does not depend on the size of the transactions mart.
     
     Args:
         offset: Starting record number (0-based)
@@ -288,15 +287,4 @@ def get_transactions_paginated(offset: int, limit: int) -> tuple[list, int]:
     Returns:
         Tuple of (page_data, total_count)
     """
-    # Get all cached transaction data (use a larger limit to get more data)
-    all_transactions = get_limited_transactions(limit=1000)  # Get more than the default 20
-    
-    # Calculate pagination
-    total_count = len(all_transactions)
-    start_idx = offset
-    end_idx = offset + limit
-    
-    # Slice the data for current page
-    page_data = all_transactions[start_idx:end_idx]
-    
-    return page_data, total_count
\ No newline at end of file
+    return get_filtered_paginated_transactions(offset, limit)
@@ -3,7 +3,7 @@ Pagination service functions for handling paginated data requests.
 """
 
 from typing import List, Dict, Tuple, Optional
-from data_access import data_access
+from data_access import data_access, TRANSACTION_KEY_COLUMNS
 from config.data_schemas import standardize_financial_data
 from utils.error_boundaries import database_boundary
 
@@ -89,42 +89,20 @@ def get_filtered_paginated_accounts(offset: int, limit: int) -> Tuple[List[Dict]
         
         # If filters are active, aggregate from filtered transactions
         if filter_state.years or filter_state.months or filter_state.quarters:
-            # Get all filtered transactions for aggregation
-            filtered_transactions = data_access.get_filtered_transactions(
+            # Aggregate and page the filtered transactions in DuckDB
+            accounts, total_count = data_access.get_filtered_account_summary(
                 years=list(filter_state.years) if filter_state.years else None,
                 quarters=list(filter_state.quarters) if filter_state.quarters else None,
                 months=list(filter_state.months) if filter_state.months else None,
-                limit=50000  # Large limit to get all for aggregation
+                limit=limit,
+                offset=offset
             )
             
-            if filtered_transactions:
-                import polars as pl
-                df = pl.DataFrame(filtered_transactions)
-                
-                # Aggregate to account level
-                accounts_df = df.group_by(["account_code", "account_name"]).agg([
-                    pl.len().alias("total_transactions"),
-                    pl.col("debit_amount").sum().alias("total_debit"),
-                    pl.col("credit_amount").sum().alias("total_credit"),
-                    pl.col("net_amount").sum().alias("net_balance"),
-                ]).with_columns([
-                    pl.when(pl.col("net_balance") > 0).then(pl.lit("Net Debit")).otherwise(pl.lit("Net Credit")).alias("account_balance_type"),
-                    pl.lit("Active").alias("activity_status")
-                ]).sort("account_code")
-                
-                # Get total count
-                total_count = len(accounts_df)
-                
-                # Apply pagination to the aggregated data
-                paginated_df = accounts_df.slice(offset, limit)
-                accounts = paginated_df.to_dicts()
-                
-                # Standardize data types
+            # Standardize data types
+            if accounts:
                 accounts = standardize_financial_data(accounts)
-                
-                return accounts, total_count
-            else:
-                return [], 0
+            
+            return accounts, total_count
         else:
             # No filters, use regular pagination
             return get_paginated_accounts(offset, limit)
@@ -135,11 +113,31 @@ def get_filtered_paginated_accounts(offset: int, limit: int) -> Tuple[List[Dict]
         return get_paginated_accounts(offset, limit)
 
 
+# Keyset cursors for transaction pages: (filters, offset) -> sort key of the
+# row just before that offset, so paging forward avoids OFFSET scans.
+_transaction_cursors: Dict[tuple, tuple] = {}
+MAX_TRANSACTION_CURSORS = 1000
+
+
+def clear_transaction_cursors() -> None:
+    """Forget all keyset cursors, e.g. after the marts have been rebuilt."""
+    _transaction_cursors.clear()
+
+# Fields shown in the paginated transactions table
+TRANSACTION_PAGE_COLUMNS = [
+    'account_code', 'account_name', 'transaction_date', 'description',
+    'debit_amount', 'credit_amount', 'net_amount'
+]
+
+
 @database_boundary('get_filtered_paginated_transactions', fallback=([], 0))
 def get_filtered_paginated_transactions(offset: int, limit: int) -> Tuple[List[Dict], int]:
     """
     Get paginated transaction data with filtering applied.
     
+    Pages are fetched with keyset pagination when the previous page has been
+    seen, falling back to LIMIT/OFFSET for direct jumps.
+    
     Args:
         offset: Number of records to skip
         limit: Maximum number of records to return
@@ -152,36 +150,42 @@ def get_filtered_paginated_transactions(offset: int, limit: int) -> Tuple[List[D
         from utils.state_management import get_current_filter_state
         filter_state = get_current_filter_state()
         
-        # If filters are active, use filtered query
-        if filter_state.years or filter_state.months or filter_state.quarters:
-            # First get total count of filtered transactions
-            all_filtered = data_access.get_filtered_transactions(
-                years=list(filter_state.years) if filter_state.years else None,
-                quarters=list(filter_state.quarters) if filter_state.quarters else None,
-                months=list(filter_state.months) if filter_state.months else None,
-                limit=None  # No limit to get count
-            )
-            total_count = len(all_filtered) if all_filtered else 0
-            
-            # Now get paginated filtered data
-            paginated_transactions = data_access.get_filtered_transactions(
-                years=list(filter_state.years) if filter_state.years else None,
-                quarters=list(filter_state.quarters) if filter_state.quarters else None,
-                months=list(filter_state.months) if filter_state.months else None,
-                limit=limit,
-                offset=offset
+        filters = {
+            'years': sorted(filter_state.years) or None,
+            'quarters': sorted(filter_state.quarters) or None,
+            'months': sorted(filter_state.months) or None,
+        }
+        # Source file selections change which rows precede a cursor too
+        from utils.source_filter import source_filter
+        filter_key = (
+            tuple(tuple(values or ()) for values in filters.values()),
+            source_filter.get_filter_key(),
+        )
+        
+        # Count and page share one connection and one set of bound filters
+        paginated_transactions, total_count = data_access.get_filtered_transactions_page(
+            **filters,
+            limit=limit,
+            offset=offset,
+            after=_transaction_cursors.get((filter_key, offset)),
+            columns=TRANSACTION_PAGE_COLUMNS + TRANSACTION_KEY_COLUMNS
+        )
+        
+        if paginated_transactions:
+            # Remember where this page ends so the next page can seek to it
+            if len(_transaction_cursors) >= MAX_TRANSACTION_CURSORS:
+                _transaction_cursors.clear()
+            next_offset = offset + len(paginated_transactions)
+            _transaction_cursors[(filter_key, next_offset)] = data_access.transaction_sort_key(
+                paginated_transactions[-1]
             )
             
             # Standardize data types
-            if paginated_transactions:
-                paginated_transactions = standardize_financial_data(paginated_transactions)
-            
-            return paginated_transactions, total_count
-        else:
-            # No filters, use regular pagination
-            return get_paginated_transactions(offset, limit)
+            paginated_transactions = standardize_financial_data(paginated_transactions)
+        
+        return paginated_transactions, total_count
             
     except Exception as e:
         print(f"Error getting filtered paginated transactions: {e}")
         # Fallback to regular pagination
-        return get_paginated_transactions(offset, limit)
\ No newline at end of file
+        return get_paginated_transactions(offset, limit)
@@ -9,6 +9,9 @@ import pytest
 from unittest.mock import MagicMock, patch, PropertyMock
 from pathlib import Path
 from datetime import datetime
+from decimal import Decimal
+
+import polars as pl
 
 from data_access import DataAccessLayer
 
@@ -32,6 +35,7 @@ def _make_conn(rows, columns):
     result = MagicMock()
     result.fetchall.return_value = rows
     result.fetchone.return_value = rows[0] if rows else None
+    result.pl.return_value = pl.DataFrame(rows, schema=columns, orient="row")
     conn.execute.return_value = result
     conn.description = [(col,) for col in columns]
     # Support context-manager usage
@@ -72,8 +76,7 @@ class TestGetFilteredTransactions:
             dal.get_filtered_transactions(years=[2021, 2022])
 
         assert "?" in captured["query"], "Expected ? placeholders in query"
-        assert 2021 in captured["params"]
-        assert 2022 in captured["params"]
+        assert [2021, 2022] in captured["params"]
         # No literal years in the query string itself
         assert "2021" not in captured["query"]
         assert "2022" not in captured["query"]
@@ -95,7 +98,7 @@ class TestGetFilteredTransactions:
         assert malicious_code not in captured["query"], (
             "SQL injection payload found in query string – parameterization failed"
         )
-        assert malicious_code in captured["params"], (
+        assert [malicious_code] in captured["params"], (
             "Malicious input should be passed as a safe parameter value"
         )
 
@@ -111,7 +114,7 @@ class TestGetFilteredTransactions:
             dal.get_filtered_transactions(amount_categories=["Large", "Medium"])
 
         assert "Large" not in captured["query"]
-        assert "Large" in captured["params"]
+        assert ["Large", "Medium"] in captured["params"]
 
     def test_limit_and_offset_are_parameterized(self, dal):
         captured = {}
@@ -146,12 +149,43 @@ class TestGetFilteredTransactions:
             )
 
         params = captured["params"]
-        assert 2023 in params
-        assert 1 in params
-        assert 2 in params
-        assert 3 in params
-        assert "80" in params
-        assert "81" in params
+        assert [2023] in params
+        assert [1, 2, 3] in params
+        assert ["80", "81"] in params
+
+    def test_keyset_cursor_replaces_offset(self, dal):
+        captured = {}
+
+        def fake_query_to_dict_list(query, params=None, **kwargs):
+            captured["query"] = query
+            captured["params"] = params or []
+            return []
+
+        cursor = ("2024-03-01", 12, 987654)
+        with patch.object(dal, "query_to_dict_list", side_effect=fake_query_to_dict_list):
+            dal.get_filtered_transactions(years=[2024], limit=20, offset=40, after=cursor)
+
+        assert "< (?, ?, ?)" in captured["query"]
+        assert captured["params"] == [[2024], "2024-03-01", 12, 987654, 20, 0]
+
+    def test_columns_projects_select_list(self, dal):
+        captured = {}
+
+        def fake_query_to_dict_list(query, params=None, **kwargs):
+            captured["query"] = query
+            return []
+
+        with patch.object(dal, "query_to_dict_list", side_effect=fake_query_to_dict_list):
+            dal.get_filtered_transactions(columns=["net_amount", "account_code"])
+
+        select_list = captured["query"].split("FROM")[0]
+        assert "account_code" in select_list
+        assert "net_amount" in select_list
+        assert "description" not in select_list
+
+    def test_unknown_column_is_rejected(self, dal):
+        with pytest.raises(ValueError):
+            dal.get_filtered_transactions(columns=["account_code; DROP TABLE x"])
 
     def test_returns_list_of_dicts(self, dal):
         """get_filtered_transactions should return a list (via query_to_dict_list)."""
@@ -164,6 +198,54 @@ class TestGetFilteredTransactions:
         assert result == expected
 
 
+# ---------------------------------------------------------------------------
+# get_filtered_transactions_count
+# ---------------------------------------------------------------------------
+
+class TestGetFilteredTransactionsCount:
+    def test_counts_in_sql_with_same_filters(self, dal):
+        captured = {}
+
+        def fake_qtdl(query, params=None, **kwargs):
+            captured["query"] = query
+            captured["params"] = params or []
+            return [{"count": 42}]
+
+        with patch.object(dal, "query_to_dict_list", side_effect=fake_qtdl):
+            result = dal.get_filtered_transactions_count(years=[2024], months=[3])
+
+        assert result == 42
+        assert "COUNT(*)" in captured["query"]
+        assert "LIMIT" not in captured["query"].upper()
+        assert captured["params"] == [[2024], [3]]
+
+
+class TestGetFilteredTransactionsPage:
+    def test_count_and_page_share_connection_and_filters(self, dal):
+        conn = _make_conn(rows=[(1, "80")], columns=["transaction_id", "account_code"])
+        conn.execute.return_value.fetchone.return_value = (7,)
+        with patch.object(dal, "get_dbt_connection", return_value=conn), \
+             patch.object(dal, "_apply_source_filter", side_effect=lambda q, p: (q, p)):
+            rows, total = dal.get_filtered_transactions_page(years=[2024], limit=10, offset=20)
+
+        assert total == 7
+        assert rows == [{"transaction_id": 1, "account_code": "80"}]
+        (count_query, count_params), (page_query, page_params) = [c.args for c in conn.execute.call_args_list]
+        assert "COUNT(*)" in count_query
+        assert count_params == [[2024]]
+        assert page_params == [[2024], 10, 20]
+
+    def test_skips_page_query_when_nothing_matches(self, dal):
+        conn = _make_conn(rows=[], columns=["transaction_id"])
+        conn.execute.return_value.fetchone.return_value = (0,)
+        with patch.object(dal, "get_dbt_connection", return_value=conn), \
+             patch.object(dal, "_apply_source_filter", side_effect=lambda q, p: (q, p)):
+            result = dal.get_filtered_transactions_page(years=[1999])
+
+        assert result == ([], 0)
+        assert conn.execute.call_count == 1
+
+
 # ---------------------------------------------------------------------------
 # get_account_summary
 # ---------------------------------------------------------------------------
@@ -260,6 +342,148 @@ class TestGetMonthlyTrends:
         assert 6 in captured["params"]
 
 
+# ---------------------------------------------------------------------------
+# get_transaction_stats – materialized summary
+# ---------------------------------------------------------------------------
+
+class TestGetTransactionStats:
+    def test_reads_stats_mart_when_unfiltered(self, dal):
+        stats = {"total_transactions": 10, "unique_accounts": 3}
+        with patch.object(dal, "_source_filter_active", return_value=False):
+            with patch.object(dal, "query_to_dict_list", return_value=[stats]) as mock_qtdl:
+                result = dal.get_transaction_stats()
+
+        assert result == stats
+        mock_qtdl.assert_called_once()
+        assert "mart_transaction_stats" in mock_qtdl.call_args[0][0]
+
+    def test_aggregates_details_when_source_filter_active(self, dal):
+        captured = {}
+
+        def fake_qtdl(query, params=None, **kwargs):
+            captured["query"] = query
+            return [{"total_transactions": 4}]
+
+        with patch.object(dal, "_source_filter_active", return_value=True):
+            with patch.object(dal, "query_to_dict_list", side_effect=fake_qtdl):
+                result = dal.get_transaction_stats()
+
+        assert result == {"total_transactions": 4}
+        assert "mart_transaction_details" in captured["query"]
+
+
+# ---------------------------------------------------------------------------
+# get_dashboard_stats – single round-trip
+# ---------------------------------------------------------------------------
+
+class TestGetDashboardStats:
+    def test_single_query_when_unfiltered(self, dal):
+        row = {
+            "total_accounts": 5, "active_accounts": 2,
+            "total_assets": 100.0, "total_liabilities": 40.0,
+            "total_transactions": 12, "unique_accounts": 5,
+        }
+        with patch.object(dal, "_source_filter_active", return_value=False):
+            with patch.object(dal, "query_to_dict_list", return_value=[row]) as mock_qtdl:
+                result = dal.get_dashboard_stats()
+
+        mock_qtdl.assert_called_once()
+        assert result["accounts"] == {"total": 5, "active": 2, "assets": 100.0, "liabilities": 40.0}
+        assert result["transactions"] == {"total_transactions": 12, "unique_accounts": 5}
+
+
+# ---------------------------------------------------------------------------
+# get_chart_aggregates – grouping pushed into SQL
+# ---------------------------------------------------------------------------
+
+class TestGetChartAggregates:
+    def test_groups_in_sql_on_one_connection(self, dal):
+        conn = _make_conn([("100-500", 3), ("1000+", 1)], ["bucket", "count"])
+        with patch.object(dal, "_apply_source_filter", side_effect=lambda q, p=None: (q, p or [])):
+            with patch.object(dal, "get_dbt_connection", return_value=conn) as mock_get_conn:
+                result = dal.get_chart_aggregates(top_accounts=5, days=7)
+
+        mock_get_conn.assert_called_once()
+        queries = [c[0][0] for c in conn.execute.call_args_list]
+        assert len(queries) == 4
+        assert all("GROUP BY" in q for q in queries[1:])
+        assert 5 in conn.execute.call_args_list[0][0][1]
+        assert 7 in conn.execute.call_args_list[2][0][1]
+        # Every range is reported in label order, zero-filled
+        assert result["amount_hist"] == {
+            "bucket": ["0-100", "100-500", "500-1000", "1000+"],
+            "count": [0, 3, 0, 1],
+        }
+
+
+class TestGetFilteredAccountSummary:
+    def test_groups_filtered_transactions_in_sql(self, dal):
+        conn = _make_conn(
+            [("80", "Bank", 3, 100.0, 40.0, 60.0, "Net Debit", "Active", 12)],
+            ["account_code", "account_name", "total_transactions", "total_debit",
+             "total_credit", "net_balance", "account_balance_type", "activity_status", "total_count"]
+        )
+        with patch.object(dal, "_apply_source_filter", side_effect=lambda q, p=None, apply=True: (q, p or [])):
+            with patch.object(dal, "get_dbt_connection", return_value=conn):
+                rows, total = dal.get_filtered_account_summary(years=[2024], limit=10, offset=20)
+
+        query, params = conn.execute.call_args[0]
+        assert "GROUP BY account_code" in query
+        assert "transaction_year = ANY(?)" in query
+        assert params == [[2024], 10, 20]
+        assert total == 12
+        assert rows == [{
+            "account_code": "80", "account_name": "Bank", "total_transactions": 3,
+            "total_debit": 100.0, "total_credit": 40.0, "net_balance": 60.0,
+            "account_balance_type": "Net Debit", "activity_status": "Active",
+        }]
+
+    def test_past_the_end_counts_with_filter_params_only(self, dal):
+        frames = [pl.DataFrame(), pl.DataFrame({"count": [7]})]
+        with patch.object(dal, "_apply_source_filter", side_effect=lambda q, p=None, apply=True: (q, p or [])):
+            with patch.object(dal, "query_to_frame", side_effect=frames) as mock_query:
+                rows, total = dal.get_filtered_account_summary(years=[2024], limit=10, offset=50)
+
+        assert (rows, total) == ([], 7)
+        count_query, count_params = mock_query.call_args_list[1][0]
+        assert "COUNT(DISTINCT account_code)" in count_query
+        assert count_params == [[2024]]
+
+    def test_empty_without_limit_skips_count_query(self, dal):
+        with patch.object(dal, "_apply_source_filter", side_effect=lambda q, p=None, apply=True: (q, p or [])):
+            with patch.object(dal, "query_to_frame", return_value=pl.DataFrame()) as mock_query:
+                rows, total = dal.get_filtered_account_summary(years=[2024], months=[1], offset=5)
+
+        assert (rows, total) == ([], 0)
+        mock_query.assert_called_once()
+
+
+class TestDbtConnection:
+    def test_cursors_share_one_read_only_connection(self, dal):
+        shared = MagicMock()
+        with patch("data_access.duckdb.connect", return_value=shared) as mock_connect:
+            first = dal.get_dbt_connection()
+            second = dal.get_dbt_connection()
+
+        mock_connect.assert_called_once_with(str(dal.dbt_warehouse_path), read_only=True)
+        assert first is shared.cursor.return_value
+        assert second is shared.cursor.return_value
+
+    def test_released_connection_is_closed_and_reopened(self, dal):
+        with patch("data_access.duckdb.connect") as mock_connect:
+            dal.get_dbt_connection()
+            shared = mock_connect.return_value
+            with dal.dbt_connection_released():
+                shared.close.assert_called_once()
+                assert dal._dbt_conn is None
+                dal.get_dbt_connection()
+                assert dal._dbt_conn is None  # per-call connection while released
+            dal.get_dbt_connection()
+
+        assert dal._dbt_conn is not None
+        assert mock_connect.call_count == 3
+
+
 # ---------------------------------------------------------------------------
 # get_last_refresh_time – error handling
 # ---------------------------------------------------------------------------
@@ -294,6 +518,27 @@ class TestQueryToDictList:
 
         assert result == [{"id": 1, "account_code": "80", "balance": 999.99}]
 
+    def test_query_to_columns_returns_column_lists(self, dal):
+        conn = _make_conn(
+            rows=[(1, "80"), (2, "81")],
+            columns=["id", "account_code"]
+        )
+        with patch.object(dal, "get_dbt_connection", return_value=conn):
+            result = dal.query_to_columns("SELECT 1", apply_source_filter=False)
+
+        assert result == {"id": [1, 2], "account_code": ["80", "81"]}
+
+    def test_decimal_columns_exported_as_float(self, dal):
+        conn = _make_conn(rows=[], columns=["id"])
+        conn.execute.return_value.pl.return_value = pl.DataFrame(
+            {"account_code": ["80"], "total_debit": [Decimal("9348770.89")]}
+        )
+        with patch.object(dal, "get_dbt_connection", return_value=conn):
+            result = dal.query_to_dict_list("SELECT 1", apply_source_filter=False)
+
+        assert result == [{"account_code": "80", "total_debit": 9348770.89}]
+        assert isinstance(result[0]["total_debit"], float)
+
     def test_empty_result_returns_empty_list(self, dal):
         conn = _make_conn(rows=[], columns=["id"])
         with patch.object(dal, "get_dbt_connection", return_value=conn):
@@ -310,3 +555,40 @@ class TestGetAvailableVersions:
         dal.iceberg_warehouse_path = Path("/nonexistent/path")
         result = dal.get_available_versions()
         assert result == []
+
+    def test_lists_only_financial_transaction_snapshots(self, dal, tmp_path):
+        (tmp_path / "financial_transactions_v1.parquet").write_bytes(b"x" * 10)
+        (tmp_path / "financial_transactions_v2.parquet").write_bytes(b"x")
+        (tmp_path / "other_table.parquet").write_bytes(b"x")
+        (tmp_path / "financial_transactions.csv").write_bytes(b"x")
+        dal.iceberg_warehouse_path = tmp_path
+
+        result = dal.get_available_versions()
+
+        assert sorted(v["file"] for v in result) == [
+            "financial_transactions_v1.parquet",
+            "financial_transactions_v2.parquet",
+        ]
+        v1 = next(v for v in result if v["file"] == "financial_transactions_v1.parquet")
+        assert v1["path"] == str(tmp_path / "financial_transactions_v1.parquet")
+        assert set(v1) == {"file", "path", "size_mb", "created", "modified"}
+
+
+class TestGetDataAtVersion:
+    def test_returns_empty_when_file_missing(self, dal, tmp_path):
+        dal.iceberg_warehouse_path = tmp_path
+        assert dal.get_data_at_version("missing.parquet") == []
+
+    def test_applies_limit_and_columns(self, dal, tmp_path):
+        pl.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}).write_parquet(
+            tmp_path / "financial_transactions_v1.parquet"
+        )
+        dal.iceberg_warehouse_path = tmp_path
+
+        assert dal.get_data_at_version("financial_transactions_v1.parquet", limit=2) == [
+            {"a": 1, "b": "x"},
+            {"a": 2, "b": "y"},
+        ]
+        assert dal.get_data_at_version(
+            "financial_transactions_v1.parquet", limit=5, columns=["b"]
+        ) == [{"b": "x"}, {"b": "y"}, {"b": "z"}]
@@ -4,10 +4,13 @@ Tests for data schema validation and standardization.
 
 import pytest
 import polars as pl
+from datetime import date
 from decimal import Decimal
 from config.data_schemas import (
     standardize_financial_data,
     validate_schema,
+    get_excel_read_options,
+    read_excel_with_schema,
     EXCEL_FINANCIAL_SCHEMA,
     DATABASE_ACCOUNT_SCHEMA
 )
@@ -58,6 +61,14 @@ class TestDataSchemas:
         assert result[0]["total_debit"] == 1000.50
         assert result[0]["total_credit"] == 500.25
     
+    def test_standardize_financial_data_already_float_returned_as_is(self):
+        """Test that rows with Float64 money columns skip the DataFrame round trip."""
+        data = [{"account_code": "80", "total_debit": 1000.50, "net_balance": None}]
+        
+        result = standardize_financial_data(data)
+        
+        assert result is data
+    
     def test_validate_schema_strict_mode(self):
         """Test schema validation in strict mode."""
         # Create test dataframe with correct types
@@ -77,6 +88,27 @@ class TestDataSchemas:
         result = validate_schema(df, expected_schema, strict=True)
         assert result.shape == df.shape
     
+    def test_validate_schema_strict_mode_reports_mismatches(self):
+        """Test that strict mode lists each mismatched column and ignores absent ones."""
+        df = pl.DataFrame({
+            "account_code": [80, 81],
+            "total_debit": ["1000", "2000"]
+        })
+        
+        expected_schema = {
+            "account_code": pl.Utf8,
+            "account_name": pl.Utf8,
+            "total_debit": pl.Float64
+        }
+        
+        with pytest.raises(ValueError) as exc_info:
+            validate_schema(df, expected_schema, strict=True)
+        
+        message = str(exc_info.value)
+        assert "'account_code'" in message
+        assert "'total_debit'" in message
+        assert "'account_name'" not in message
+    
     def test_validate_schema_lenient_mode(self):
         """Test schema validation in lenient mode."""
         # Create test dataframe with wrong types
@@ -105,6 +137,37 @@ class TestDataSchemas:
         for col in expected_columns:
             assert col in EXCEL_FINANCIAL_SCHEMA
     
+    def test_excel_read_options_type_text_columns_at_parse_time(self):
+        """Test that only text columns are forced by the calamine parser."""
+        options = get_excel_read_options("ledger.xlsx")
+        
+        assert options['engine'] == 'calamine'
+        assert 'schema_overrides' not in options
+        dtypes = options['read_options']['dtypes']
+        assert dtypes['account_code'] == 'string'
+        assert 'amount' not in dtypes
+        assert 'transaction_date' not in dtypes
+    
+    def test_read_excel_with_text_dates_and_amounts(self, tmp_path):
+        """Test that text-typed dates are parsed and non-numeric amounts are kept."""
+        pytest.importorskip("xlsxwriter")
+        file_path = tmp_path / "ledger.xlsx"
+        pl.DataFrame({
+            "CodeGrootboekrekening": ["0080", "0081"],
+            "Boekdatum": ["02-01-2024", "03-01-2024"],
+            "transaction_date": ["2024-01-02", "2024-01-03"],
+            "Debet": ["12.5", "n.v.t."],
+            "Credit": ["1", "2.5"],
+        }).write_excel(file_path)
+        
+        df = read_excel_with_schema(str(file_path))
+        
+        assert df["CodeGrootboekrekening"].to_list() == ["0080", "0081"]
+        assert df["Boekdatum"].to_list() == [date(2024, 1, 2), date(2024, 1, 3)]
+        assert df["transaction_date"].to_list() == [date(2024, 1, 2), date(2024, 1, 3)]
+        assert df["Debet"].to_list() == ["12.5", "n.v.t."]
+        assert df["Credit"].to_list() == [1.0, 2.5]
+    
     def test_database_account_schema_completeness(self):
         """Test that database account schema contains expected columns."""
         expected_columns = [
@@ -226,17 +226,18 @@ class TestDataService:
         assert len(page_data) == 10
         assert page_data[0]["account_code"] == "ACC0"
     
-    @patch('services.data_service.get_limited_transactions')  
-    def test_get_transactions_paginated(self, mock_get_transactions):
+    @patch('services.data_service.get_filtered_paginated_transactions')
+    def test_get_transactions_paginated(self, mock_get_page):
         """Test paginated transactions function."""
         mock_transactions = [{"account_code": f"ACC{i}", "description": f"Transaction {i}"} for i in range(15)]
-        mock_get_transactions.return_value = mock_transactions
+        mock_get_page.return_value = (mock_transactions[:5], 15)
         
         # Test pagination
         page_data, total_count = get_transactions_paginated(0, 5)
         assert total_count == 15
         assert len(page_data) == 5
         assert page_data[0]["account_code"] == "ACC0"
+        mock_get_page.assert_called_once_with(0, 5)
     
     @patch('services.data_service.data_access')
     def test_get_limited_transactions_sorting(self, mock_data_access):
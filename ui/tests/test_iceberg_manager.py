@@ -0,0 +1,49 @@
+"""
+Tests for data version allocation in the Iceberg manager.
+"""
+
+import sys
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "pipelines"))
+
+from iceberg_manager import IcebergManager
+
+
+def _manager(warehouse_path: Path) -> IcebergManager:
+    """Manager on a bare warehouse directory, without loading a config file."""
+    manager = IcebergManager.__new__(IcebergManager)
+    manager.warehouse_path = warehouse_path
+    manager._conn = None
+    manager._versions_cache = None
+    return manager
+
+
+class TestNextDataVersion:
+    """Test seeding and allocation of data versions."""
+
+    def test_seed_skips_unreadable_files(self, tmp_path):
+        """Test that a corrupt version file does not reset the seed to 0."""
+        pl.DataFrame({"_data_version": [1730000000]}).write_parquet(
+            tmp_path / "financial_transactions_a.parquet"
+        )
+        (tmp_path / "financial_transactions_b.parquet").write_bytes(b"PAR1 partial write")
+        manager = _manager(tmp_path)
+
+        assert manager.next_data_version("a.xlsx") == 1730000001
+        assert manager.next_data_version("b.xlsx") == 1730000002
+
+    def test_no_zero_seed_when_versions_unreadable(self, tmp_path):
+        """Test that allocation fails rather than seeding 0 above unreadable versions."""
+        (tmp_path / "financial_transactions_a.parquet").write_bytes(b"corrupt")
+        manager = _manager(tmp_path)
+
+        with pytest.raises(RuntimeError):
+            manager.next_data_version("a.xlsx")
+
+    def test_empty_warehouse_starts_at_one(self, tmp_path):
+        """Test that a warehouse without version files starts at version 1."""
+        assert _manager(tmp_path).next_data_version("a.xlsx") == 1
@@ -4,8 +4,11 @@ Tests for pagination functionality.
 
 import pytest
 from unittest.mock import Mock, patch
-from components.pagination import PaginationState, create_pagination_controls, get_pagination_state
-from components.table_components import create_paginated_table
+from nicegui import ui
+from components.pagination import (
+    PaginationState, create_page_size_selector, create_pagination_controls, get_pagination_state
+)
+from components.table_components import create_paginated_table, invalidate_page_caches
 from services.data_service import get_accounts_paginated, get_transactions_paginated
 
 
@@ -109,6 +112,22 @@ class TestPaginationState:
         # Last page (partial)
         state.current_page = 4
         assert state.get_page_info() == "Showing 61-65 of 65 records"
+    
+    def test_state_changes_propagate_to_bindings(self):
+        """Test bound targets follow page and total changes."""
+        from nicegui import binding
+        
+        state = PaginationState(page_size=20)
+        target = Mock()
+        for attribute in ('current_page', 'total_pages'):
+            binding.bind_from(target, 'text', state, attribute,
+                              backward=lambda _: f'{state.current_page} / {state.total_pages}')
+        
+        state.update_total_records(65)
+        assert target.text == "1 / 4"
+        
+        state.go_next()
+        assert target.text == "2 / 4"
 
 
 class TestPaginationFunctions:
@@ -142,12 +161,12 @@ class TestPaginationFunctions:
         assert page_data[0]["account_code"] == "ACC040"
         assert page_data[9]["account_code"] == "ACC049"
     
-    @patch('services.data_service.get_limited_transactions')
-    def test_get_transactions_paginated(self, mock_get_transactions):
-        """Test transactions pagination function."""
-        # Mock data: 30 transactions
+    @patch('services.data_service.get_filtered_paginated_transactions')
+    def test_get_transactions_paginated(self, mock_get_page):
+        """Test transactions pagination delegates LIMIT/OFFSET to the database."""
+        # Mock data: 30 transactions, sliced the way LIMIT/OFFSET would
         mock_transactions = [{"account_code": f"ACC{i:03d}", "description": f"Transaction {i}"} for i in range(30)]
-        mock_get_transactions.return_value = mock_transactions
+        mock_get_page.side_effect = lambda offset, limit: (mock_transactions[offset:offset + limit], 30)
         
         # Test first page
         page_data, total_count = get_transactions_paginated(0, 15)
@@ -155,6 +174,7 @@ class TestPaginationFunctions:
         assert len(page_data) == 15
         assert page_data[0]["account_code"] == "ACC000"
         assert page_data[14]["account_code"] == "ACC014"
+        mock_get_page.assert_called_with(0, 15)
         
         # Test second page
         page_data, total_count = get_transactions_paginated(15, 15)
@@ -162,6 +182,7 @@ class TestPaginationFunctions:
         assert len(page_data) == 15
         assert page_data[0]["account_code"] == "ACC015"
         assert page_data[14]["account_code"] == "ACC029"
+        mock_get_page.assert_called_with(15, 15)
     
     def test_get_pagination_state(self):
         """Test global pagination state management."""
@@ -218,6 +239,112 @@ class TestPaginationIntegration:
         assert isinstance(page_data, list)
         assert isinstance(total_count, int)
         assert total_count >= 0
+    
+    def test_paginated_table_caches_visited_pages(self):
+        """Test that revisiting a page does not call the data function again."""
+        data_func = Mock(side_effect=lambda offset, limit: ([{"a": offset}], 40))
+        page_callback = {}
+        
+        with patch('components.table_components.create_pagination_controls',
+                   lambda state, on_change, table_id: page_callback.setdefault('load', on_change)):
+            card = create_paginated_table(data_func, ["a"], "cached-table", page_size=10)
+            page_callback['load'](2)
+            page_callback['load'](1)
+            page_callback['load'](2)
+            assert data_func.call_count == 2
+            
+            card.invalidate_cache()
+            page_callback['load'](2)
+            assert data_func.call_count == 3
+    
+    def test_paginated_table_does_not_cache_empty_pages(self):
+        """Test that an empty (e.g. failed-query fallback) page is fetched again."""
+        results = iter([([], 0), ([{"a": 1}], 1), ([{"a": 2}], 1)])
+        data_func = Mock(side_effect=lambda offset, limit: next(results))
+        page_callback = {}
+        
+        with patch('components.table_components.create_pagination_controls',
+                   lambda state, on_change, table_id: page_callback.setdefault('load', on_change)):
+            create_paginated_table(data_func, ["a"], "retry-table", page_size=10)
+            page_callback['load'](1)
+            page_callback['load'](1)
+            assert data_func.call_count == 2
+            
+            # A data refresh drops the cached pages of every table
+            invalidate_page_caches()
+            page_callback['load'](1)
+            assert data_func.call_count == 3
+    
+    def test_paginated_table_element_holds_current_page(self):
+        """Test that the server-side table element reflects the page shown."""
+        data_func = Mock(side_effect=lambda offset, limit: ([{"a": f"row-{offset}"}], 40))
+        page_callback = {}
+        
+        with patch('components.table_components.create_pagination_controls',
+                   lambda state, on_change, table_id: page_callback.setdefault('load', on_change)):
+            card = create_paginated_table(data_func, ["a"], "synced-table", page_size=10)
+            page_callback['load'](3)
+        
+        table_html = next(el for el in card.descendants() if isinstance(el, ui.html))
+        assert "row-20" in table_html.content
+        assert "row-0" not in table_html.content
+        assert 'id="synced-table"' in table_html.content
+
+
+class TestPaginationControls:
+    """Test pagination controls bound to the pagination state."""
+    
+    def test_page_info_follows_page_size_change_on_first_page(self):
+        """Test that the page info label updates when only the page size changes."""
+        state = PaginationState(page_size=20)
+        state.update_total_records(100)
+        on_change = Mock()
+        
+        controls = create_pagination_controls(state, Mock(), "size-table")
+        selector = create_page_size_selector(state, on_change)
+        page_info = next(el for el in controls.descendants()
+                         if isinstance(el, ui.label) and el.text.startswith('Showing'))
+        assert page_info.text == "Showing 1-20 of 100 records"
+        
+        size_select = next(el for el in selector.descendants() if isinstance(el, ui.select))
+        size_select.value = '50'
+        
+        on_change.assert_called_once_with(50)
+        assert state.current_page == 1
+        assert page_info.text == "Showing 1-50 of 100 records"
+
+
+class TestTransactionCursors:
+    """Test keyset cursors for filtered transaction pages."""
+    
+    def test_cursor_is_keyed_on_source_filter_and_cleared_on_refresh(self):
+        """Test that a cursor is reused only under the same source filter and data."""
+        from services import pagination_service
+        from utils.source_filter import source_filter
+        
+        row = {"transaction_id": 9, "transaction_date": "2024-01-31", "booking_number": 3}
+        page = Mock(return_value=([row], 100))
+        pagination_service.clear_transaction_cursors()
+        saved = (source_filter.filter_enabled, set(source_filter.selected_files))
+        try:
+            source_filter.filter_enabled = False
+            with patch.object(pagination_service.data_access, 'get_filtered_transactions_page', page):
+                pagination_service.get_filtered_paginated_transactions(0, 1)
+                pagination_service.get_filtered_paginated_transactions(1, 1)
+                assert page.call_args.kwargs['after'] == ("2024-01-31", 3, 9)
+                
+                source_filter.filter_enabled = True
+                source_filter.selected_files = {"DUMP2021.xlsx"}
+                pagination_service.get_filtered_paginated_transactions(1, 1)
+                assert page.call_args.kwargs['after'] is None
+                
+                source_filter.filter_enabled = False
+                pagination_service.clear_transaction_cursors()
+                pagination_service.get_filtered_paginated_transactions(1, 1)
+                assert page.call_args.kwargs['after'] is None
+        finally:
+            source_filter.filter_enabled, source_filter.selected_files = saved
+            pagination_service.clear_transaction_cursors()
 
 
 class TestPaginationEdgeCases:
@@ -0,0 +1,42 @@
+"""
+Tests for tab management and lazy tab content.
+"""
+
+from nicegui import ui
+from components.tab_manager import TabManager
+
+
+class TestLazyTabPanels:
+    """Test lazily built tab panels."""
+
+    def _create(self):
+        manager = TabManager()
+        with ui.column() as tabs_parent:
+            with ui.tabs() as tabs:
+                manager.create_tabs({'overview': {'label': 'Overview'}, 'details': {'label': 'Details'}})
+        with ui.tab_panels(tabs, value=manager.tabs['overview']):
+            manager.create_lazy_tab_panel('overview', lambda: ui.label('overview content'))
+            manager.create_lazy_tab_panel('details', lambda: ui.label('details content'))
+        return manager, tabs_parent
+
+    def test_initially_active_panel_content_is_built_in_panel(self):
+        """Test that the active tab's content is built inside its own panel."""
+        manager, _ = self._create()
+
+        panel = manager.get_tab_panel('overview')
+        labels = [child for child in panel.default_slot.children if isinstance(child, ui.label)]
+        assert [label.text for label in labels] == ['overview content']
+
+    def test_tab_change_builds_content_in_panel(self):
+        """Test that content loaded on tab change lands in the panel, not next to the tabs."""
+        manager, tabs_parent = self._create()
+        panel = manager.get_tab_panel('details')
+        assert panel.default_slot.children == []
+
+        # NiceGUI runs value-change handlers in the tabs' parent slot
+        with tabs_parent:
+            manager.on_active_change('Details')
+
+        labels = [child for child in panel.default_slot.children if isinstance(child, ui.label)]
+        assert [label.text for label in labels] == ['details content']
+        assert not any(isinstance(child, ui.label) for child in tabs_parent.default_slot.children)
@@ -4,7 +4,8 @@ Tests for table components and formatting.
 
 import pytest
 from decimal import Decimal
-from components.table_components import create_bulma_table
+from components.table_components import create_bulma_table, render_rows, column_role
+from config.constants import ColumnRole
 
 
 class TestTableComponents:
@@ -142,4 +143,34 @@ class TestTableComponents:
         result_str = self._get_html_content(result)
         assert 'id="test-table"' in result_str
         assert "table is-striped is-hoverable is-fullwidth" in result_str
-        assert "table-container" in result_str
\ No newline at end of file
+        assert "table-container" in result_str
+    
+    def test_render_rows_matches_table_body(self, sample_account_data):
+        """Test that render_rows produces only the rows of the full table."""
+        columns = ["account_code", "account_name", "total_transactions"]
+        rows_html = render_rows(sample_account_data, columns)
+        result_str = self._get_html_content(create_bulma_table(sample_account_data, columns))
+        
+        assert rows_html.startswith("<tr>")
+        assert "<thead" not in rows_html
+        assert rows_html in result_str
+    
+    def test_column_roles(self):
+        """Test registry lookups and the name-based fallback for unknown columns."""
+        assert column_role("net_amount") == ColumnRole.CURRENCY
+        assert column_role("total_debit") == ColumnRole.NUMERIC
+        # Registered as text although the name contains a currency keyword
+        assert column_role("amount_category") == ColumnRole.TEXT
+        # Unknown columns are classified by name
+        assert column_role("opening_balance") == ColumnRole.CURRENCY
+        assert column_role("file_size_mb") == ColumnRole.INTEGER
+        assert column_role("comment") == ColumnRole.TEXT
+    
+    def test_text_values_are_escaped(self):
+        """Test that non-numeric cell values are HTML-escaped."""
+        test_data = [{"description": "<script>alert(1)</script> & co", "status": "Processed"}]
+        result_str = self._get_html_content(create_bulma_table(test_data, ["description", "status"]))
+        
+        assert "<script>" not in result_str
+        assert "&lt;script&gt;alert(1)&lt;/script&gt; &amp; co" in result_str
+        assert "fa-check-circle" in result_str  # Trusted status markup is kept
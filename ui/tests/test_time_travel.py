@@ -0,0 +1,49 @@
+"""
+Tests for the time travel audit trail.
+"""
+
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+import polars as pl
+
+# time_travel imports iceberg_manager as a sibling module
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "pipelines"))
+
+from time_travel import TimeTravel
+
+
+class TestAuditTrail:
+    """Test audit trails across data versions."""
+
+    def test_audit_trail_combines_string_and_categorical_versions(self, tmp_path):
+        """Test that versions written before and after the Categorical cleaning plan combine."""
+        old = tmp_path / "financial_transactions_v1.parquet"
+        new = tmp_path / "financial_transactions_v2.parquet"
+        pl.DataFrame({
+            "CodeGrootboekrekening": ["80", "81"],
+            "NaamGrootboekrekening": ["Kas", "Bank"],
+            "Boekdatum": [date(2024, 1, 1), date(2024, 1, 2)],
+        }).write_parquet(old)
+        pl.DataFrame({
+            "CodeGrootboekrekening": ["80"],
+            "NaamGrootboekrekening": pl.Series(["Kas"], dtype=pl.Categorical),
+            "Boekdatum": [date(2024, 1, 3)],
+            "Debet": [10.0],
+        }).write_parquet(new)
+
+        manager = Mock()
+        manager.list_versions.return_value = [
+            {"file": new.name, "created": datetime(2024, 2, 1)},
+            {"file": old.name, "created": datetime(2024, 1, 1)},
+        ]
+        manager.version_path.side_effect = lambda name: tmp_path / name
+
+        result = TimeTravel(manager).audit_trail(account_code="80")
+
+        assert result["NaamGrootboekrekening"].dtype == pl.String
+        assert result["NaamGrootboekrekening"].to_list() == ["Kas", "Kas"]
+        assert result["_version_file"].to_list() == [old.name, new.name]
+        assert result["Debet"].to_list() == [None, 10.0]
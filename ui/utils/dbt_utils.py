@@ -3,12 +3,19 @@ DBT utilities for extracting runtime information.
 """
 
 import re
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 from config.constants import Paths
 
 
+def _read_log_tail(log_path: Path, max_lines: int) -> deque:
+    """Return the last ``max_lines`` lines of a log without loading the whole file."""
+    with open(log_path, 'r') as f:
+        return deque(f, maxlen=max_lines)
+
+
 def get_dbt_last_run() -> str:
     """
     Extract the last run time from dbt log file.
@@ -23,15 +30,14 @@ def get_dbt_last_run() -> str:
     
     try:
         # Read the last few lines of the log file for performance
-        with open(dbt_log_path, 'r') as f:
-            lines = f.readlines()
+        lines = _read_log_tail(dbt_log_path, 100)
         
         # Look for the last successful or failed command
         last_command = None
         last_time = None
         
         # Search backwards through the log for command completion
-        for line in reversed(lines[-100:]):  # Check last 100 lines
+        for line in reversed(lines):  # Check last 100 lines
             # Look for command completion patterns
             if 'Command `dbt' in line and ('failed at' in line or 'succeeded at' in line):
                 # Extract command and time
@@ -75,13 +81,12 @@ def get_dbt_run_status() -> dict:
         }
     
     try:
-        with open(dbt_log_path, 'r') as f:
-            lines = f.readlines()
+        lines = _read_log_tail(dbt_log_path, 200)
         
         # Look for recent command completions
         recent_commands = []
         
-        for line in reversed(lines[-200:]):  # Check last 200 lines
+        for line in reversed(lines):  # Check last 200 lines
             if 'Command `dbt' in line and ('failed at' in line or 'succeeded at' in line):
                 command_match = re.search(r'Command `(dbt [^`]+)`', line)
                 time_match = re.search(r'at (\d{2}:\d{2}:\d{2})', line)
@@ -146,11 +151,10 @@ def get_dbt_command_status(command_type: str) -> dict:
         }
     
     try:
-        with open(dbt_log_path, 'r') as f:
-            lines = f.readlines()
+        lines = _read_log_tail(dbt_log_path, 300)
         
         # Look for the most recent run of the specific command
-        for line in reversed(lines[-300:]):  # Check last 300 lines
+        for line in reversed(lines):  # Check last 300 lines
             if f'Command `dbt {command_type}' in line and ('failed at' in line or 'succeeded at' in line):
                 command_match = re.search(r'Command `(dbt [^`]+)`', line)
                 time_match = re.search(r'at (\d{2}:\d{2}:\d{2})', line)
@@ -45,6 +45,12 @@ class SourceFileFilter:
         """Get list of selected files."""
         return list(self.selected_files)
     
+    def get_filter_key(self) -> Optional[frozenset]:
+        """Get a hashable snapshot of the active filter, for keying caches."""
+        if not self.filter_enabled or not self.selected_files:
+            return None
+        return frozenset(self.selected_files)
+    
     def get_filter_condition(self) -> Optional[tuple[str, list]]:
         """Get parameterized SQL filter condition for selected files.
 
@@ -57,6 +57,18 @@ class FilterState:
         
         return state
     
+    def cache_key(self) -> tuple:
+        """Get a hashable snapshot of the filters, for keying caches."""
+        date_range = tuple(sorted(self.date_range.items())) if self.date_range else None
+        return (
+            frozenset(self.years),
+            frozenset(self.months),
+            frozenset(self.quarters),
+            frozenset(self.account_codes),
+            date_range,
+            self.search_term,
+        )
+    
     def is_empty(self) -> bool:
         """Check if filter state is empty."""
         return (
@@ -19,7 +19,8 @@ def get_filtered_stats(selected_years: Set, selected_months: Set, selected_quart
         years=list(selected_years) if selected_years else None,
         quarters=list(selected_quarters) if selected_quarters else None,
         months=list(selected_months) if selected_months else None,
-        limit=50000  # High limit to get all for stats
+        limit=50000,  # High limit to get all for stats
+        columns=['account_code', 'debit_amount', 'credit_amount', 'net_amount']
     )
     
     if not filtered_transactions: